@@ -1,21 +1,108 @@
 # -*- coding: utf-8 -*-
 
+from __future__ import annotations
+
+import base64
+import bisect
+import collections
+import fnmatch
+import functools
+import hashlib
+import importlib
+import importlib.util
+import itertools
+import atexit
 import json
 import logging as log
+import logging.handlers
+import math
+import mmap
 import os.path
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
 import types
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, List, Optional
 
-import coloredlogs
-import matplotlib.pyplot as plt
-from matplotlib import colormaps
 import numpy as np
-import pandas as pd
-import xlwings as xl
-from colorama import Fore, Style
-import sqlite3 as sql
+
+
+class LazyImport(types.ModuleType):
+    """
+    Placeholder for a module (or an attribute of a module) that is only imported the first
+    time one of its attributes is used. Keeps `import Common` cheap for scripts that only need
+    the light helpers (`LoggingHelper`, `TimeStamp`, macros...), and keeps optional or
+    platform-specific packages (e.g. xlwings on headless Linux) from failing at import time.
+    """
+    def __init__(self, module_name: str, attribute: Optional[str] = None):
+        super().__init__(module_name if attribute is None else f"{module_name}.{attribute}")
+        self._lazy_module_name = module_name
+        self._lazy_attribute = attribute
+        self._lazy_target = None
+        self._lazy_found = None
+
+    def _lazy_available(self) -> bool:
+        """
+        Whether the module can be imported, checked without importing it (for optional
+        dependencies)
+        """
+        if self._lazy_found is None:
+            try:
+                self._lazy_found = importlib.util.find_spec(self._lazy_module_name) is not None
+            except (ImportError, ValueError):
+                self._lazy_found = False
+        return self._lazy_found
+
+    def _lazy_load(self) -> Any:
+        if self._lazy_target is None:
+            _target = importlib.import_module(self._lazy_module_name)
+            if self._lazy_attribute is not None:
+                _target = getattr(_target, self._lazy_attribute)
+            self._lazy_target = _target
+        return self._lazy_target
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_lazy_"):
+            raise AttributeError(item)
+        return getattr(self._lazy_load(), item)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._lazy_load()[key]
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._lazy_load()(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._lazy_load())
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self) -> str:
+        _state = "loaded" if self._lazy_target is not None else "not loaded"
+        return f"<lazy import '{self.__name__}' ({_state})>"
+
+
+asyncio = LazyImport("asyncio")
+futures = LazyImport("concurrent.futures")
+csv = LazyImport("csv")
+coloredlogs = LazyImport("coloredlogs")
+plt = LazyImport("matplotlib.pyplot")
+colormaps = LazyImport("matplotlib", "colormaps")
+pd = LazyImport("pandas")
+xl = LazyImport("xlwings")
+Fore = LazyImport("colorama", "Fore")
+Style = LazyImport("colorama", "Style")
+sql = LazyImport("sqlite3")
+
+orjson = LazyImport("orjson")    # optional, check with orjson._lazy_available()
+msgpack = LazyImport("msgpack")  # optional, check with msgpack._lazy_available()
 
 # region MACROS
 # region BCOLORS
@@ -412,13 +499,208 @@ def INK_NameToFocusChannelLCH(name: str):
 
 # endregion
 
+# region SERIALIZER_BACKEND
+SERIALIZER_BACKEND = types.SimpleNamespace()
+"""
+Macros for choosing the backend used by `Serializable` to encode objects
+
+| Backend | Type | Value | Output |
+|---|---|---|---|
+| `SERIALIZER_BACKEND.Json` | `str` | `"json"` | JSON text (stdlib) |
+| `SERIALIZER_BACKEND.OrJson` | `str` | `"orjson"` | JSON text (needs `orjson`) |
+| `SERIALIZER_BACKEND.MsgPack` | `str` | `"msgpack"` | Binary (needs `msgpack`) |
+| `SERIALIZER_BACKEND.Binary` | `str` | `"binary"` | JSON header + raw array buffers (files only) |
+| `SERIALIZER_BACKEND.Auto` | `str` | `"auto"` | Fastest JSON backend installed |
+"""
+SERIALIZER_BACKEND.Json = "json"
+SERIALIZER_BACKEND.OrJson = "orjson"
+SERIALIZER_BACKEND.MsgPack = "msgpack"
+SERIALIZER_BACKEND.Binary = "binary"
+SERIALIZER_BACKEND.Auto = "auto"
+
+DICT_serializer_backend_extensions: dict = {
+    "msgpack": SERIALIZER_BACKEND.MsgPack,
+    "mpk": SERIALIZER_BACKEND.MsgPack,
+    "sbin": SERIALIZER_BACKEND.Binary
+}
+"""
+File extensions that select a backend other than JSON in `Serializable.to_file`/`from_file`
+"""
+# endregion
+
+# region FIGURE_JOB
+FIGURE_JOB = types.SimpleNamespace()
+"""
+Kinds of jobs accepted by `FigureRenderer.render_batch`
+
+| Job | Type | Value | Arguments |
+|---|---|---|---|
+| `FIGURE_JOB.Signals` | `str` | `"signals"` | `Plotting.plotSetOfSignals` keyword arguments |
+| `FIGURE_JOB.Grid` | `str` | `"grid"` | `FigureRenderer.render_grid` keyword arguments |
+| `FIGURE_JOB.Figs` | `str` | `"figs"` | `FigureRenderer.render_figs` keyword arguments |
+"""
+FIGURE_JOB.Signals = "signals"
+FIGURE_JOB.Grid = "grid"
+FIGURE_JOB.Figs = "figs"
+# endregion
+
 # region UNIT_CONVERSIONS:
 MM_PER_INCH = 24.5
 MARGIN_AVERAGE_MULTIPLIER = 3
 # endregion
 # endregion
 
+class JsonLogFormatter(log.Formatter):
+    """
+    Formats log records as one JSON object per line: time, level, logger name, file, function,
+    line, message and, if any, the formatted exception
+    """
+    def format(self, record: log.LogRecord) -> str:
+        _entry = {"ts": record.created,
+                  "level": record.levelname,
+                  "name": record.name,
+                  "file": record.filename,
+                  "func": record.funcName,
+                  "line": record.lineno,
+                  "msg": record.getMessage()}
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            _entry["exc"] = record.exc_text
+        return json.dumps(_entry, default=str)
+
+
+class _MessageOnlyQueueHandler(log.handlers.QueueHandler):
+    """
+    QueueHandler that only merges the message arguments on the calling thread; the actual
+    formatting is left to the listener thread
+    """
+    def prepare(self, record: log.LogRecord) -> log.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = log.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 class LoggingHelper(object):
+    TEXT_FORMAT = '[%(asctime)s]\t%(levelname)s\t(%(filename)s/%(funcName)s)\t%(message)s'
+    LEVEL_STYLES = {
+        'critical': {'bold': True, 'color': 'red'},
+        'debug': {'color': 'black'},
+        'error': {'color': 'red'},
+        'info': {'color': 'cyan'},
+        'notice': {'color': 'magenta'},
+        'spam': {'color': 'green', 'faint': True},
+        'success': {'bold': True, 'color': 'green'},
+        'verbose': {'color': 'blue'},
+        'warning': {'color': 'yellow'}
+        }
+    FIELD_STYLES = {
+        'asctime': {'bold': True, 'color': 'black'},
+        'hostname': {'color': 'magenta'},
+        'levelname': {'bold': True, 'color': 'black'},
+        'name': {'bold': True, 'color': 'black'},
+        'programname': {'bold': True, 'color': 'black'},
+        'username': {'color': 'yellow'},
+        'funcName': {'bold': True, 'color': 'black'}
+        }
+    _listeners: dict = {}
+
+    @staticmethod
+    def get_production_logger(level: str = 'INFO', name: Optional[str] = None,
+                              file_path: Optional[str] = None) -> log.Logger:
+        """
+        Returns a low-overhead logger for hot loops: records are pushed to a queue by a
+        `QueueHandler` and written as JSON lines by a `QueueListener` thread, so I/O and
+        formatting happen off the calling thread. Calls below `level` are dropped by the
+        logger's cached level check before any formatting happens. With `name=None` the root
+        logger is configured (replacing its handlers), which is what `log.info(...)` uses
+        across this module.
+
+        Args:
+            level (str, optional): Minimum level to be logged. Defaults to 'INFO'.
+            name (Optional[str], optional): Logger name, root logger if None. Defaults to None.
+            file_path (Optional[str], optional): Write JSON lines to this file instead of
+                stderr. Defaults to None.
+
+        Returns:
+            log.Logger: Configured logger
+        """
+        _logger = log.getLogger(name)
+        LoggingHelper.stop_production_logger(name)
+        for _handler in list(_logger.handlers):
+            _logger.removeHandler(_handler)
+
+        _target = log.FileHandler(file_path) if file_path is not None else log.StreamHandler(sys.stderr)
+        _target.setFormatter(JsonLogFormatter())
+        _queue: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = log.handlers.QueueListener(_queue, _target, respect_handler_level=False)
+        _listener.start()
+        LoggingHelper._listeners[name] = _listener
+        atexit.register(LoggingHelper.stop_production_logger, name)
+
+        _logger.addHandler(_MessageOnlyQueueHandler(_queue))
+        _logger.setLevel(level)
+        if name is not None:
+            _logger.propagate = False
+        return _logger
+
+    @staticmethod
+    def stop_production_logger(name: Optional[str] = None):
+        """
+        Flushes the queue of a production logger and stops its listener thread (also done
+        automatically at exit)
+
+        Args:
+            name (Optional[str], optional): Logger name, root logger if None. Defaults to None.
+        """
+        _listener = LoggingHelper._listeners.pop(name, None)
+        if _listener is not None:
+            _listener.stop()
+
+    @staticmethod
+    def benchmark_overhead(n_calls: int = 100000) -> dict:
+        """
+        Per-call cost on the calling thread of an enabled and a disabled log call, for the
+        coloredlogs text setup and for the production (queue + JSON) setup, both writing to
+        os.devnull
+
+        Args:
+            n_calls (int, optional): Calls per measurement. Defaults to 100000.
+
+        Returns:
+            dict: {(setup, 'enabled' | 'disabled'): nanoseconds per call}
+        """
+        results = {}
+        with open(os.devnull, "w") as _devnull:
+            _text = log.getLogger("Common.benchmark.text")
+            _text.propagate = False
+            _text_handler = log.StreamHandler(_devnull)
+            _text_handler.setFormatter(coloredlogs.ColoredFormatter(fmt=LoggingHelper.TEXT_FORMAT,
+                                                                    level_styles=LoggingHelper.LEVEL_STYLES,
+                                                                    field_styles=LoggingHelper.FIELD_STYLES))
+            _text.addHandler(_text_handler)
+            _text.setLevel('INFO')
+
+            _prod = LoggingHelper.get_production_logger('INFO', name="Common.benchmark.production",
+                                                        file_path=os.devnull)
+
+            for _setup, _logger in (("text", _text), ("production", _prod)):
+                for _state, _method in (("enabled", _logger.info), ("disabled", _logger.debug)):
+                    _start = time.perf_counter()
+                    for i in range(n_calls):
+                        _method("value %d of %s", i, _state)
+                    results[(_setup, _state)] = (time.perf_counter() - _start) / n_calls * 1e9
+
+            LoggingHelper.stop_production_logger("Common.benchmark.production")
+            _text.removeHandler(_text_handler)
+
+        for (_setup, _state), _ns in results.items():
+            log.info(f"{_setup:<11} {_state:<9} {_ns:10.1f} ns/call")
+        return results
+
     @staticmethod
     def get_logger(level: str = 'INFO'):
         """
@@ -433,30 +715,194 @@ class LoggingHelper(object):
             log: Created logger
         """
         return coloredlogs.install(level=level,
-                                   fmt='[%(asctime)s]\t%(levelname)s\t(%(filename)s/%(funcName)s)\t%(message)s',
+                                   fmt=LoggingHelper.TEXT_FORMAT,
                                 #    datefmt='%H:%M:%S',
-                                   level_styles={
-                                       'critical': {'bold': True, 'color': 'red'},
-                                       'debug': {'color': 'black'},
-                                       'error': {'color': 'red'},
-                                       'info': {'color': 'cyan'},
-                                       'notice': {'color': 'magenta'},
-                                       'spam': {'color': 'green', 'faint': True},
-                                       'success': {'bold': True, 'color': 'green'},
-                                       'verbose': {'color': 'blue'},
-                                       'warning': {'color': 'yellow'}
-                                       },
-                                   field_styles={
-                                       'asctime': {'bold': True, 'color': 'black'},
-                                       'hostname': {'color': 'magenta'},
-                                       'levelname': {'bold': True, 'color': 'black'},
-                                       'name': {'bold': True, 'color': 'black'},
-                                       'programname': {'bold': True, 'color': 'black'},
-                                       'username': {'color': 'yellow'},
-                                       'funcName': {'bold': True, 'color': 'black'}
-                                       },
+                                   level_styles=LoggingHelper.LEVEL_STYLES,
+                                   field_styles=LoggingHelper.FIELD_STYLES,
                                    isatty=True
-                                   )        
+                                   )
+
+
+class TTLCache(object):
+    """
+    Thread-safe LRU cache whose entries also expire ttl seconds after being stored.
+    Least recently used entries are evicted once maxsize is reached.
+    """
+    def __init__(self, maxsize: int = 1 << 16, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            _item = self._data.get(key)
+            if _item is None:
+                return default
+            if _item[0] < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return _item[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DirectoryIndex(object):
+    """
+    In-memory index of the files under a directory tree, by extension and by modification
+    time, built by a single crawl. `refresh` only stats each known directory and rescans the
+    ones whose mtime changed (files added, removed or renamed), so repeated batch runs over
+    big, mostly unchanged corpora are cheap. In-place edits of a file don't change its
+    directory's mtime; its indexed timestamp is the one seen when its directory was scanned.
+
+    Usage:
+        index = FileManagement.crawl("./data")
+        index.glob("*.p??"); index.by_extension("pgm"); index.modified_between(t0, t1)
+        index.refresh()
+    """
+    def __init__(self, root: str, recursive: bool = True):
+        self.root = os.path.normpath(root)  # paths are normalized once, scandir keeps them so
+        self.recursive = recursive
+        self._dirs: dict = {}      # dir -> (mtime_ns, {path: ext}, [subdirs])
+        self._by_ext: dict = {}    # ext -> {path: mtime}
+        self._by_time = None       # (sorted mtimes, paths) built on demand
+        self.refresh()
+
+    def _forget_dir(self, dir_path: str):
+        _mtime, _files, _subdirs = self._dirs.pop(dir_path)
+        self._by_time = None
+        for _path, _ext in _files.items():
+            _bucket = self._by_ext.get(_ext)
+            if _bucket is not None:
+                _bucket.pop(_path, None)
+        for _sub in _subdirs:
+            if _sub in self._dirs:
+                self._forget_dir(_sub)
+
+    def _scan_dir(self, dir_path: str, dir_mtime: int) -> list[str]:
+        _files = {}
+        _subdirs = []
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _subdirs.append(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):  # symlinks, fifos, sockets...
+                    continue
+                _name, _dot, _ext = entry.name.rpartition(".")
+                _ext = _ext if _dot else ""
+                try:
+                    _mtime = entry.stat(follow_symlinks=False).st_mtime
+                except OSError:
+                    continue
+                _files[entry.path] = _ext
+                self._by_ext.setdefault(_ext, {})[entry.path] = _mtime
+        self._dirs[dir_path] = (dir_mtime, _files, _subdirs)
+        return _subdirs
+
+    def refresh(self) -> int:
+        """
+        Brings the index up to date, rescanning only the directories that changed
+
+        Returns:
+            int: Number of directories (re)scanned
+        """
+        _scanned = 0
+        _stack = [self.root]
+        _seen = set()
+        while _stack:
+            _dir = _stack.pop()
+            _seen.add(_dir)
+            try:
+                _mtime = os.stat(_dir).st_mtime_ns
+            except OSError:
+                if _dir in self._dirs:
+                    self._forget_dir(_dir)
+                continue
+            _known = self._dirs.get(_dir)
+            if _known is not None and _known[0] == _mtime:
+                _subdirs = _known[2]
+            else:
+                if _known is not None:
+                    self._dirs[_dir] = (_known[0], _known[1], [])
+                    self._forget_dir(_dir)
+                try:
+                    _subdirs = self._scan_dir(_dir, _mtime)
+                except OSError as ex:
+                    log.warning(f"Unable to scan '{_dir}' ({ex}), moving on...")
+                    continue
+                _scanned += 1
+            if self.recursive:
+                _stack.extend(_subdirs)
+        for _dir in [_d for _d in self._dirs if _d not in _seen]:
+            if _dir in self._dirs:
+                self._forget_dir(_dir)
+        if _scanned:
+            self._by_time = None
+        log.debug(f"Index of '{self.root}' refreshed, {_scanned} dirs scanned")
+        return _scanned
+
+    def __len__(self) -> int:
+        return sum(len(_bucket) for _bucket in self._by_ext.values())
+
+    def extensions(self) -> dict[str, int]:
+        """
+        Returns:
+            dict[str, int]: Files per extension ("" for files without one)
+        """
+        return {_ext: len(_bucket) for _ext, _bucket in self._by_ext.items() if _bucket}
+
+    def by_extension(self, *extensions: str) -> list[str]:
+        """
+        Returns:
+            list[str]: Sorted paths of the files with any of the given extensions
+        """
+        return sorted(_path for _ext in extensions for _path in self._by_ext.get(_ext, ()))
+
+    def glob(self, pattern: str) -> list[str]:
+        """
+        Indexed equivalent of `glob.glob(root + "/**/" + pattern)` on the file names
+        (e.g. "*.pgm", "*.p??"). The extension of the pattern, when literal, narrows the
+        search to its bucket.
+
+        Returns:
+            list[str]: Sorted matching paths
+        """
+        _ext = pattern.rpartition(".")[2] if "." in pattern else None
+        if _ext is not None and not any(_c in _ext for _c in "*?["):
+            _candidates = self._by_ext.get(_ext, {})
+        else:
+            _candidates = (_path for _bucket in self._by_ext.values() for _path in _bucket)
+        _regex = re.compile(fnmatch.translate(os.path.normcase(pattern)))
+        return sorted(_path for _path in _candidates
+                      if _regex.match(os.path.normcase(os.path.basename(_path))))
+
+    def modified_between(self, start: float = -math.inf, end: float = math.inf) -> list[str]:
+        """
+        Files whose modification time (epoch seconds) is in [start, end), oldest first
+
+        Returns:
+            list[str]: Paths
+        """
+        if self._by_time is None:
+            _items = sorted((_mtime, _path) for _bucket in self._by_ext.values()
+                            for _path, _mtime in _bucket.items())
+            self._by_time = ([_item[0] for _item in _items], [_item[1] for _item in _items])
+        _times, _paths = self._by_time
+        return _paths[bisect.bisect_left(_times, start):bisect.bisect_left(_times, end)]
 
 
 class FileManagement(object):
@@ -548,15 +994,68 @@ class FileManagement(object):
             
         return temp_dir, TimeStamp.formatted()
     
+    DELETE_BATCH_SIZE = 256
+
+    @staticmethod
+    def _iter_temp_files(temp_dir: str, time_stamp: Optional[str] = None, 
+                         match_prefix: bool = False):
+        """
+        Lazily yields the paths of the temp files inside temp_dir, using the file type cached
+        by `os.scandir` (no extra stat per entry)
+
+        Args:
+            temp_dir (str): Temp directory
+            time_stamp (Optional[str], optional): Only yield files containing it. Defaults to None.
+            match_prefix (bool, optional): Only yield files starting with time_stamp. 
+                Defaults to False.
+        """
+        with os.scandir(temp_dir) as entries:
+            for entry in entries:
+                _name = entry.name
+                if "." not in _name:
+                    continue
+                if time_stamp is not None:
+                    if match_prefix:
+                        if not _name.startswith(time_stamp):
+                            continue
+                    elif time_stamp not in _name:
+                        continue
+                if entry.is_dir(follow_symlinks=False):
+                    continue
+                yield entry.path
+
+    @staticmethod
+    def _remove_files(file_paths: list[str]) -> int:
+        """
+        Removes a batch of files, warning about (and skipping) the ones that fail
+
+        Returns:
+            int: Number of files removed
+        """
+        _removed = 0
+        for file in file_paths:
+            try:
+                os.remove(file)
+                _removed += 1
+            except Exception as ex1:
+                log.warning(f"Unable to delete '{file}' ({ex1}), moving on...")
+        return _removed
+
     @staticmethod
     def delete_temp_files(path:str, 
                           time_stamp: Optional[str] = None, 
-                          custom_subdir_name: Optional[str] =None):
+                          custom_subdir_name: Optional[str] =None,
+                          n_workers: int = 8,
+                          match_prefix: bool = False):
         """
         Removes all temporary files. If time_stamp specified, it will only remove the files with
         said time_stamp, else, it will remove all files inside the dir (files only, not subdirs)
         When function ends, checks if temporary dir is empty, and if so, it deletes it as well.
         
+        The directory is streamed with `os.scandir` and files are removed in batches by a pool
+        of threads (unlink is I/O bound and releases the GIL), with a bounded amount of batches
+        in flight, so memory stays flat even with hundreds of thousands of files.
+        
         | Exit Code | Meaning |
         |---|---|
         | -1 | Errors, operation not completed |
@@ -571,6 +1070,10 @@ class FileManagement(object):
             custom_subdir_name (Optional[str], optional): In case you have defined a custom subdir
                 name for the temporary name, operate on that dir. If not specified, will operate
                 onto './temp' Variable defaults to None.
+            n_workers (int, optional): Deleting threads, 1 deletes serially. Defaults to 8.
+            match_prefix (bool, optional): Match time_stamp only at the start of the file name
+                (as written by `create_temp_folder` users), instead of anywhere in it. 
+                Defaults to False.
 
         Returns:
             int: Exit code
@@ -580,38 +1083,45 @@ class FileManagement(object):
         if custom_subdir_name is not None:
             temp_dir = f"{path}/{custom_subdir_name}"
             
+        _removed = 0
+        _found = 0
         try:
-            temp_files_list = os.listdir(temp_dir)
-            temp_files_list = list(filter(lambda x: "." in x, temp_files_list))
-            
-            if len(temp_files_list) == 0:
-                log.debug(f"Temp dir ({temp_dir}) is already empty")
-                return 1
+            _batches = FileManagement._batched(
+                FileManagement._iter_temp_files(temp_dir, time_stamp, match_prefix),
+                FileManagement.DELETE_BATCH_SIZE)
             
-            if time_stamp is not None:
-                try:
-                    temp_files_list = list(filter(lambda x: time_stamp in x, temp_files_list))
-                    if len(temp_files_list) == 0:
-                        log.debug(f"There are no files inside the temp dir ({temp_files_list}) "
-                                f"with the specified TimeStamp ({time_stamp})")
-                        return 1
-                except Exception as ex1:
-                    log.error("Failed trying to find any file with the specified "
-                            f"TimeStamp ({time_stamp}) inside the temp dir ({temp_dir})")
-                    return -1
+            if n_workers <= 1:
+                for _batch in _batches:
+                    _found += len(_batch)
+                    _removed += FileManagement._remove_files(_batch)
+            else:
+                with futures.ThreadPoolExecutor(max_workers=n_workers) as pool:
+                    _pending = set()
+                    for _batch in _batches:
+                        _found += len(_batch)
+                        _pending.add(pool.submit(FileManagement._remove_files, _batch))
+                        if len(_pending) >= 2 * n_workers:
+                            _done, _pending = futures.wait(_pending, 
+                                                           return_when=futures.FIRST_COMPLETED)
+                            _removed += sum(_f.result() for _f in _done)
+                    _removed += sum(_f.result() for _f in futures.as_completed(_pending))
             
-            for file in temp_files_list:
-                try:
-                    os.remove(f"{temp_dir}/{file}")
-                    log.debug(f"Successfully deleted '{file}'")
-                except Exception as ex1:
-                    log.warning(f"Unable to delete '{file}' ({ex1}), moving on...")
+            if _found == 0:
+                if time_stamp is None:
+                    log.debug(f"Temp dir ({temp_dir}) is already empty")
+                else:
+                    log.debug(f"There are no files inside the temp dir ({temp_dir}) "
+                              f"with the specified TimeStamp ({time_stamp})")
+                return 1
+            log.debug(f"Deleted {_removed}/{_found} files from '{temp_dir}'")
         
         except Exception as ex:
             log.error(f"Failed deleting temp files ({ex})")
             return -1
             
-        if len(os.listdir(temp_dir)) == 0:
+        with os.scandir(temp_dir) as entries:
+            _is_empty = next(entries, None) is None
+        if _is_empty:
             try:
                 os.rmdir(temp_dir)
                 log.debug(f"Dir ({temp_dir}) was empty after process, successfully removed it")
@@ -624,19 +1134,82 @@ class FileManagement(object):
         return 0
 
     @staticmethod
-    def isFile(path:str) -> tuple[bool, int]:
+    def _batched(iterable, size: int):
+        """
+        Yields tuples of up to size items (`itertools.batched`, which needs Python 3.12)
+        """
+        _it = iter(iterable)
+        while _batch := tuple(itertools.islice(_it, size)):
+            yield _batch
+
+    @staticmethod
+    async def delete_temp_files_async(path: str, 
+                                      time_stamp: Optional[str] = None, 
+                                      custom_subdir_name: Optional[str] = None,
+                                      n_workers: int = 8,
+                                      match_prefix: bool = False) -> int:
+        """
+        Awaitable `delete_temp_files`, for services cleaning up in the background: the whole
+        cleanup runs on the loop's default executor, so the event loop is never blocked.
+
+        Args:
+            Same as `delete_temp_files`
+
+        Returns:
+            int: Exit code (see `delete_temp_files`)
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(FileManagement.delete_temp_files, path, time_stamp,
+                                    custom_subdir_name, n_workers, match_prefix))
+
+    _path_cache: Optional[TTLCache] = None
+
+    @classmethod
+    def enable_path_cache(cls, maxsize: int = 1 << 16, ttl: float = 5.0):
+        """
+        Caches the results of `isFile` (and so of `isFolder`, `getFileExtension` and
+        `checkFileIsValid`) in an LRU cache whose entries expire after ttl seconds, so files
+        created or removed meanwhile are eventually seen
+
+        Args:
+            maxsize (int, optional): Maximum cached paths. Defaults to 65536.
+            ttl (float, optional): Seconds a result stays valid. Defaults to 5.0.
+        """
+        cls._path_cache = TTLCache(maxsize, ttl)
+
+    @classmethod
+    def disable_path_cache(cls):
+        """
+        Drops the path cache, every call hits the file system again
+        """
+        cls._path_cache = None
+
+    @staticmethod
+    def _final_name(path: str) -> str:
         if "/" in path:
-            _final_dir = path.split("/")[-1]
-        elif "\\" in path:
-            _final_dir = path.split("\\")[-1]
-        else: return(False, -1)
+            return path[path.rfind("/") + 1:]
+        if "\\" in path:
+            return path[path.rfind("\\") + 1:]
+        return path
+
+    @classmethod
+    def isFile(cls, path:str) -> tuple[bool, int]:
+        _cache = cls._path_cache
+        if _cache is not None:
+            ret = _cache.get(path)
+            if ret is not None:
+                return ret
         
-        if not os.path.exists(path):
-            return (False, -1)
+        if "/" not in path and "\\" not in path:
+            ret = (False, -1)
+        elif not os.path.exists(path):
+            ret = (False, -1)
+        else:
+            ret = ("." in cls._final_name(path), 0)
         
-        if "." in _final_dir:
-            return True, 0
-        else: return False, 0
+        if _cache is not None:
+            _cache.put(path, ret)
+        return ret
     
     @classmethod
     def isFolder(cls, path:str) -> tuple[bool, int]:
@@ -653,22 +1226,82 @@ class FileManagement(object):
             log.warning("Passed path is not a file")
             return None
         
-        file = ""
-        if "/" in path:
-            file = path.split("/")[-1]
-        elif "\\" in path:
-            file = path.split("\\")[-1]
-        else: 
-            file = path
-        
-        return file.split(".")[-1] 
+        return cls._final_name(path).rpartition(".")[2]
     
     @classmethod
     def checkFileIsValid(cls, path, validExtensions):
-        if cls.getFileExtension(path) in validExtensions:
-            return True
-        else:
-            return False       
+        if not cls.isFile(path)[0]:
+            return False
+        return cls._final_name(path).rpartition(".")[2] in validExtensions
+
+    @staticmethod
+    def scan_tree(root: str, recursive: bool = True, include_folders: bool = False):
+        """
+        Classifies every entry under root in a single `os.scandir` pass per directory, using
+        the type cached in each `DirEntry` (no stat or exists call per entry). Only regular
+        files and real folders are reported: symlinks (to files or folders) and special files
+        are skipped, so nothing is followed into or mislabelled.
+
+        Args:
+            root (str): Directory to scan
+            recursive (bool, optional): Descend into subdirectories. Defaults to True.
+            include_folders (bool, optional): Also yield folders. Defaults to False.
+
+        Yields:
+            tuple[str, bool, Optional[str]]: (path, is_file, extension), extension is None for
+                folders and for files without one
+        """
+        _stack = [root]
+        while _stack:
+            _dir = _stack.pop()
+            try:
+                with os.scandir(_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                _stack.append(entry.path)
+                            if include_folders:
+                                yield entry.path, False, None
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        _name, _dot, _ext = entry.name.rpartition(".")
+                        yield entry.path, True, (_ext if _dot else None)
+            except OSError as ex:
+                log.warning(f"Unable to scan '{_dir}' ({ex}), moving on...")
+
+    @staticmethod
+    def crawl(root: str, recursive: bool = True) -> DirectoryIndex:
+        """
+        Walks root once and returns an index of its files by extension and timestamp,
+        see `DirectoryIndex` (call its `refresh` to update it incrementally)
+
+        Args:
+            root (str): Directory to crawl
+            recursive (bool, optional): Descend into subdirectories. Defaults to True.
+
+        Returns:
+            DirectoryIndex: Index
+        """
+        return DirectoryIndex(root, recursive)
+
+    @classmethod
+    def find_valid_files(cls, root: str, validExtensions, recursive: bool = True) -> list[str]:
+        """
+        Batch `checkFileIsValid` over a whole tree: paths of the files under root whose
+        extension is in validExtensions
+
+        Args:
+            root (str): Directory to scan
+            validExtensions (Iterable[str]): Accepted extensions (without the dot)
+            recursive (bool, optional): Descend into subdirectories. Defaults to True.
+
+        Returns:
+            list[str]: Matching file paths (scandir order)
+        """
+        _valid = frozenset(validExtensions)
+        return [_path for _path, _is_file, _ext in cls.scan_tree(root, recursive)
+                if _ext in _valid]
         
     
 class MathAndStatistics(object):
@@ -691,7 +1324,53 @@ class MathAndStatistics(object):
             y = y*x + a 
         
         return y
-    
+
+    @staticmethod
+    def poly_eval_batch(coefs: np.ndarray | list[list[float]], x: np.ndarray | float,
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized version of `poly_eval`: evaluates a set of polynomials over a whole array of
+        x points at once with Horner's method, one NumPy operation per coefficient column.
+
+        Args:
+            coefs (np.ndarray | list[list[float]]): Coefficient matrix of shape (k, n), one
+                polynomial per row, from higher power to lower (m_n, m_n-1 ... m_1, n). A 1D
+                vector is taken as a single polynomial. Empty polynomials (no coefficient
+                columns) evaluate to 0 everywhere, like `poly_eval`.
+            x (np.ndarray | float): X points (any shape) where to evaluate every polynomial
+            out (Optional[np.ndarray], optional): Preallocated float buffer for the result, so hot
+                loops don't allocate. Defaults to None.
+
+        Returns:
+            np.ndarray: y with shape (k, *x.shape), or x.shape if `coefs` was 1D
+        """
+        _coefs = np.asarray(coefs, dtype=float)
+        _x = np.asarray(x, dtype=float)
+        _single = _coefs.ndim == 1
+        _coefs = np.atleast_2d(_coefs)
+        if _coefs.ndim != 2:
+            raise ValueError(f"Coefficients must be a vector or a 2D matrix, got shape {_coefs.shape}")
+
+        _shape = _x.shape if _single else (_coefs.shape[0],) + _x.shape
+        if out is None:
+            out = np.empty(_shape, dtype=np.result_type(_coefs, _x))
+        elif out.shape != _shape:
+            raise ValueError(f"Output buffer has shape {out.shape}, expected {_shape}")
+
+        if _coefs.shape[1] == 0:
+            out[...] = 0
+            return out
+
+        # one coefficient column per power, shaped to broadcast against x: (n, [k,] 1, 1, ...)
+        _cols = _coefs.T.reshape((_coefs.shape[1],) + _shape[:len(_shape) - _x.ndim] + (1,) * _x.ndim)
+
+        out[...] = _cols[0]
+        for _col in _cols[1:]:
+            np.multiply(out, _x, out=out)
+            np.add(out, _col, out=out)
+
+        return out
+
     @staticmethod
     def simple_amplityde_from_signal(signal: list[float | int] | np.ndarray) -> float:
         """
@@ -710,137 +1389,829 @@ class MathAndStatistics(object):
         return _ampl
     
     @staticmethod
-    def remove_outliers_from_signal(data: np.ndarray | list[float], max_stdev: float = 3.0, window_size: int = 30):
+    def remove_outliers_from_signal(data: np.ndarray | list[float], max_stdev: float = 3.0, window_size: int = 30,
+                                    in_place: bool = False) -> np.ndarray:
         """
         Code that removes outliers from a uniformity level density reading array. Takes every
-        value that fall outside of the condition `standard_deviation < m`, and sets them to the 
+        value that fall outside of the condition `standard_deviation < m`, and sets them to the
         value of its surroundings accordding to the window size.
-        
+
+        The replacement value is the mean of the `window_size // 2` samples at each side of the
+        outlier (the outlier itself excluded). Near the edges of the signal the window is clipped
+        instead of wrapping around. Window sums are obtained from a single cumulative sum, so
+        the cost is linear in the signal length and only the outliers are touched.
 
         Args:
             data (np.ndarray | list): Uniformity measurements
             max_stdev (float, optional): Maximum accepted standard deviation. Defaults to 3.
-            window (int, optional): Window size for returning those values to normal. Defaults 
+            window_size (int, optional): Window size for returning those values to normal. Defaults
                 to 30.
+            in_place (bool, optional): Write the corrected values back into `data` instead of
+                returning a copy. Only possible for writable floating point arrays, else a copy
+                is made. Defaults to False.
 
         Returns:
-            np.ndarray | list: Passed data set with the outliers corrected
+            np.ndarray: Passed data set with the outliers corrected
         """
+        if in_place and not (isinstance(data, np.ndarray) and data.flags.writeable
+                             and np.issubdtype(data.dtype, np.floating)):
+            log.warning("In-place outlier removal needs a writable float array, working on a copy")
+            in_place = False
+
+        _data = data if in_place else np.array(data, dtype=float)
+        if _data.size == 0:
+            return _data
 
-        _d = np.abs(data - np.median(data))
+        _d = np.abs(_data - np.median(_data))
         _mdev = np.median(_d)
-        _s = _d/_mdev if _mdev else np.zeros(len(_d))
-        
-        data_removed = [data[i] if _s[i] < max_stdev 
-                        else np.average(np.concatenate(
-                            (data[i- window_size//2: i - 1], 
-                                data[i + 1: i + window_size//2]))) 
-                        for i in range(len(data))]    
-            
-        return data_removed        
+        if not _mdev:
+            return _data
 
+        _outliers = np.flatnonzero(_d >= max_stdev * _mdev)
+        if _outliers.size == 0:
+            return _data
+
+        _data[_outliers] = MathAndStatistics._window_means(_data, _outliers, max(window_size // 2, 1))
+
+        return _data
 
-class TimeStamp(object):
     @staticmethod
-    def formatted(timestamp_format: str = "%Y%m%d_%H%M%S") -> str:
+    def _window_means(data: np.ndarray, indices: np.ndarray, half: int) -> np.ndarray:
         """
-        Generates a timestamp in a certain format (defaulting to 'YYYYmmdd_HHMMSS') 
-        for the time when it is called
+        Mean of the `half` samples at each side of every index (the sample itself excluded),
+        with the window clipped at the edges of `data`. Sums come from a single cumulative sum.
 
         Args:
-            timestamp_format (str, optional): Format for the timestamp. Defaults to "%Y%m%d_%H%M%S".
+            data (np.ndarray): Signal
+            indices (np.ndarray): Positions where the window mean is wanted
+            half (int): Samples taken at each side
 
         Returns:
-            str: Time stamp in text form
+            np.ndarray: Window mean for each index (the sample itself if it has no neighbours)
         """
-        return datetime.fromtimestamp(datetime.now().timestamp()).strftime(timestamp_format)
+        _csum = np.empty(data.size + 1, dtype=np.float64)
+        _csum[0] = 0.0
+        np.cumsum(data, out=_csum[1:])
 
+        _lo = np.maximum(indices - half, 0)
+        _hi = np.minimum(indices + half + 1, data.size)
+        _counts = _hi - _lo - 1
+        _sums = _csum[_hi] - _csum[_lo] - data[indices]
 
-class Serializable(FileManagement):
-    """
-    Abstract class for classes that have to be serializable. Includes methods for working with
-    text JSONs, as well as some extra comodity methods for excluding private elements from 
-    those JSON strings, passing a reference to the possible outer class of an inner one, and a
-    config dialog (most of the abstract methods comming empty)
-    """
-    _outer: Any = field(default=None)
+        # a lone sample has no neighbours to average from, so it is left untouched
+        return np.where(_counts > 0, _sums / np.maximum(_counts, 1), data[indices])
 
-    def exclude_private(self) -> dict:
+    @staticmethod
+    def _iter_signal_chunks(source, chunk_size: int):
         """
-        Excludes private properties from dictionary for JSON serialization
-
-        :return: (dict) Filtered dictionary
+        Yields float chunks from a `.npy` path (memory-mapped), an array, a callable returning an
+        iterator of chunks, or an iterator of chunks.
         """
-        no_private: dict = self.__dict__.copy()
-        keys_to_pop = list([key for key, val in self.__dict__.items() if key[0] == "_"])
-        for key in keys_to_pop:
-            no_private.pop(key)
-        return no_private
+        if isinstance(source, str):
+            source = np.load(FileManagement.path_to_python(source), mmap_mode='r')
+        elif callable(source):
+            source = source()
 
-    @classmethod    # FIXME: should be private but have to fix class parity in InspectionLibEfi first
-    def from_dict(cls, self: Any) -> Optional[object]:
-        """
-        Helper class for deserializing JSONs
+        if isinstance(source, np.ndarray):
+            _flat = source.reshape(-1)
+            for _start in range(0, _flat.size, chunk_size):
+                yield np.asarray(_flat[_start:_start + chunk_size], dtype=float)
+        else:
+            for _chunk in source:
+                yield np.asarray(_chunk, dtype=float).reshape(-1)
 
-        Args:
-            self (Any): Any type object, used to help deserialization
-        
-        Returns:
-            object: Object of current class with info from json string
+    @staticmethod
+    def remove_outliers_from_stream(source, max_stdev: float = 3.0, window_size: int = 30,
+                                    chunk_size: int = 1 << 20, sketch_size: int = 4096):
         """
-        log.warning("This class does not implement this method")
-        return None
+        Streaming version of `remove_outliers_from_signal`, for signals that do not fit in memory.
+        Yields the corrected signal chunk by chunk, keeping only `window_size` samples of overlap
+        between chunks, so peak memory depends on `chunk_size` and not on the signal length.
 
-    @classmethod
-    def deserialize(cls, json_string: str) -> object:
-        """
-        Deserializes JSON string to object according to the cls.from_dict method
+        The median and the median absolute deviation are estimated with a `QuantileSketch`.
+        If `source` can be read twice (`.npy` path, array/memmap or a callable returning a fresh
+        iterator) a first pass computes the statistics and a second one filters. A one-shot
+        iterator is filtered in a single pass, each chunk using the statistics gathered up to
+        and including itself, so the first chunks may be judged with rougher estimates.
+
+        Tolerance: the sketch keeps the rank error of both statistics around `1 / sketch_size`
+        (~0.03 % with the default size). Results match the in-memory version (up to floating point
+        rounding of the window sums) except for samples whose deviation lies within that margin
+        of the `max_stdev` threshold.
 
         Args:
-            json_string (str): Serialized object
-        
-        Returns:
-            object: Object from json
+            source (str | np.ndarray | Callable | Iterable): Path to a `.npy` file, array or
+                memmap, callable returning an iterator of chunks, or iterator of chunks
+            max_stdev (float, optional): Maximum accepted standard deviation. Defaults to 3.
+            window_size (int, optional): Window size for returning those values to normal.
+                Defaults to 30.
+            chunk_size (int, optional): Samples per chunk when slicing arrays. Defaults to 2**20.
+            sketch_size (int, optional): Centroids kept by the quantile sketch. Defaults to 4096.
+
+        Yields:
+            np.ndarray: Consecutive chunks of the signal with the outliers corrected
         """
+        _half = max(window_size // 2, 1)
+        _sketch = QuantileSketch(sketch_size)
+        _two_pass = isinstance(source, (str, np.ndarray)) or callable(source)
 
-        _obj: type(cls) = cls.from_dict(json.loads(json_string)) # type: ignore
+        if _two_pass:
+            for _chunk in MathAndStatistics._iter_signal_chunks(source, chunk_size):
+                _sketch.update(_chunk)
+
+        _buf = np.empty(0, dtype=float)
+        _context = 0  # leading samples of _buf already yielded, kept as left context
+
+        def _filter(buf: np.ndarray, start: int, stop: int) -> np.ndarray:
+            _median = _sketch.quantile(0.5)
+            _mdev = _sketch.median_abs_deviation(_median)
+            _segment = buf[start:stop].copy()
+            if not _mdev:
+                return _segment
+            _outliers = np.flatnonzero(np.abs(_segment - _median) >= max_stdev * _mdev)
+            if _outliers.size:
+                _segment[_outliers] = MathAndStatistics._window_means(buf, _outliers + start, _half)
+            return _segment
+
+        for _chunk in MathAndStatistics._iter_signal_chunks(source, chunk_size):
+            if not _two_pass:
+                _sketch.update(_chunk)
+            _buf = np.concatenate((_buf, _chunk))
+            _ready = _buf.size - _half  # samples before this one already have full right context
+            if _ready > _context:
+                yield _filter(_buf, _context, _ready)
+                _keep_from = max(_ready - _half, 0)
+                _buf = _buf[_keep_from:].copy()
+                _context = _ready - _keep_from
+
+        if _buf.size > _context:
+            yield _filter(_buf, _context, _buf.size)
+
+
+class QuantileSketch(object):
+    """
+    Bounded-memory approximate quantile estimator for streamed data (t-digest like, with
+    equal-weight centroids). Values are merged chunk by chunk and, once more than `size`
+    centroids are held, compressed back to `size` centroids of equal weight, so the rank
+    error of any estimated quantile stays around `1 / size`.
+    """
+    def __init__(self, size: int = 4096):
+        self._size = max(int(size), 2)
+        self._values = np.empty(0, dtype=float)
+        self._weights = np.empty(0, dtype=float)
+        self.count = 0
+
+    def update(self, values: np.ndarray | list[float]):
+        """
+        Adds a chunk of values to the sketch
+
+        Args:
+            values (np.ndarray | list[float]): New samples
+        """
+        _v = np.asarray(values, dtype=float).reshape(-1)
+        if _v.size == 0:
+            return
+        self.count += _v.size
+        self._values = np.concatenate((self._values, _v))
+        self._weights = np.concatenate((self._weights, np.ones(_v.size)))
+        if self._values.size > self._size:
+            self._compress()
+
+    def _compress(self):
+        _order = np.argsort(self._values, kind='stable')
+        _values, _weights = self._values[_order], self._weights[_order]
+        _cum = np.cumsum(_weights)
+        _edges = np.linspace(0, _cum[-1], self._size + 1)[1:-1]
+        _starts = np.unique(np.concatenate(([0], np.searchsorted(_cum, _edges, side='right'))))
+        _starts = _starts[_starts < _values.size]
+        _w = np.add.reduceat(_weights, _starts)
+        self._values = np.add.reduceat(_values * _weights, _starts) / _w
+        self._weights = _w
+
+    @staticmethod
+    def _weighted_quantile(values: np.ndarray, weights: np.ndarray, q: float) -> float:
+        _order = np.argsort(values, kind='stable')
+        _values, _weights = values[_order], weights[_order]
+        _mid = np.cumsum(_weights) - _weights / 2.0
+        return float(np.interp(q * _weights.sum(), _mid, _values))
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated q-quantile of all the values seen so far
+
+        Args:
+            q (float): Quantile in [0, 1]
+
+        Returns:
+            float: Estimation (NaN if the sketch is empty)
+        """
+        if self._values.size == 0:
+            return float('nan')
+        return self._weighted_quantile(self._values, self._weights, q)
+
+    def median_abs_deviation(self, center: Optional[float] = None) -> float:
+        """
+        Estimated median of the absolute deviations from `center` (the median if not given)
+
+        Args:
+            center (Optional[float], optional): Reference value. Defaults to None.
+
+        Returns:
+            float: Estimation (NaN if the sketch is empty)
+        """
+        if self._values.size == 0:
+            return float('nan')
+        if center is None:
+            center = self.quantile(0.5)
+        return self._weighted_quantile(np.abs(self._values - center), self._weights, 0.5)
+
+
+class LookupTable(object):
+    """
+    Lookup-table engine for point-wise intensity transforms of integer images. The transform
+    is evaluated once over every possible input value (256 for 8-bit, 65536 for 16-bit
+    images), cached per (function, parameters, depths), and applied with `np.take` over
+    cache-sized blocks of pixels, so the intp index temporary never leaves the CPU cache.
+
+    Usage:
+        gamma = lambda x, g: 255.0 * (x / 255.0) ** g
+        out = LookupTable.transform(image, gamma, 0.5, out_dtype=PIXEL_DEPTH.BIT8)
+    """
+    BLOCK_PIXELS = 1 << 16
+    MAX_TABLES = 256
+    _tables = collections.OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def table(cls, func, *params, depth=PIXEL_DEPTH.BIT8, out_dtype=None) -> np.ndarray:
+        """
+        Table of func(x, *params) for every value x of depth, cached
+
+        Args:
+            func (Callable): Vectorized transform, called once as func(np.arange(...), *params)
+            *params: Transform parameters (must be hashable)
+            depth (np.dtype, optional): `PIXEL_DEPTH.BIT8` or `PIXEL_DEPTH.BIT16`. 
+                Defaults to PIXEL_DEPTH.BIT8.
+            out_dtype (np.dtype, optional): If given, the table is clipped to its range and cast
+                (truncating, like `astype`), else kept as func returns it. Defaults to None.
+
+        Returns:
+            np.ndarray: Read-only table, None if depth is not supported
+        """
+        _depth = np.dtype(depth)
+        if _depth not in (np.dtype(PIXEL_DEPTH.BIT8), np.dtype(PIXEL_DEPTH.BIT16)):
+            log.error(f"Lookup tables are only supported for 8 and 16 bit depths ({_depth})")
+            return None
+        _key = (func, params, _depth.str, None if out_dtype is None else np.dtype(out_dtype).str)
+        with cls._lock:
+            _table = cls._tables.get(_key)
+            if _table is not None:
+                cls._tables.move_to_end(_key)
+                return _table
+        
+        _table = np.asarray(func(np.arange(np.iinfo(_depth).max + 1, dtype=_depth), *params))
+        if out_dtype is not None:
+            _out = np.dtype(out_dtype)
+            if _out.kind in "ui":
+                _info = np.iinfo(_out)
+                _table = np.clip(_table, _info.min, _info.max)
+            _table = _table.astype(_out)
+        _table.setflags(write=False)
+        with cls._lock:
+            cls._tables[_key] = _table
+            if len(cls._tables) > cls.MAX_TABLES:
+                cls._tables.popitem(last=False)
+        return _table
+
+    @classmethod
+    def apply(cls, image: np.ndarray, table: np.ndarray, 
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Maps every pixel of an integer image through table
+
+        Args:
+            image (np.ndarray): uint8/uint16 image
+            table (np.ndarray): Table covering every value of image's depth
+            out (Optional[np.ndarray], optional): Output array (image's shape, table's dtype);
+                may be image itself when the dtypes match. Defaults to None.
+
+        Returns:
+            np.ndarray: Transformed image
+        """
+        if out is None:
+            out = np.empty(image.shape, dtype=table.dtype)
+        _src = image.reshape(-1) if image.flags.c_contiguous else image.ravel()
+        _dst = out.reshape(-1)
+        if not np.shares_memory(_dst, out):
+            np.take(table, image, out=out)
+            return out
+        _block = cls.BLOCK_PIXELS
+        for _start in range(0, _src.size, _block):
+            np.take(table, _src[_start:_start + _block], out=_dst[_start:_start + _block])
+        return out
+
+    @classmethod
+    def histogram(cls, image: np.ndarray) -> np.ndarray:
+        """
+        Exact histogram of an uint8/uint16 image, one bin per gray level, accumulated with
+        `np.bincount` over cache-sized blocks of pixels
+
+        Args:
+            image (np.ndarray): uint8/uint16 image
+
+        Returns:
+            np.ndarray: int64 counts, 256 or 65536 bins
+        """
+        _src = image.reshape(-1) if image.flags.c_contiguous else image.ravel()
+        _nbins = np.iinfo(image.dtype).max + 1
+        _hist = np.zeros(_nbins, dtype=np.int64)
+        _block = cls.BLOCK_PIXELS
+        for _start in range(0, _src.size, _block):
+            _hist += np.bincount(_src[_start:_start + _block], minlength=_nbins)
+        return _hist
+
+    @classmethod
+    def transform(cls, image: np.ndarray, func, *params, out_dtype=None,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        func(image, *params) through a cached table when image is uint8/uint16, else
+        evaluated directly
+
+        Args:
+            image (np.ndarray): Image
+            func (Callable): Vectorized transform
+            *params: Transform parameters (hashable)
+            out_dtype (np.dtype, optional): See `table`. Defaults to None.
+            out (Optional[np.ndarray], optional): See `apply`. Defaults to None.
+
+        Returns:
+            np.ndarray: Transformed image
+        """
+        if image.dtype in (np.uint8, np.uint16):
+            return cls.apply(image, cls.table(func, *params, depth=image.dtype, 
+                                              out_dtype=out_dtype), out)
+        _res = func(image, *params)
+        return _res if out_dtype is None else np.asarray(_res).astype(out_dtype)
+
+
+class TimeStamp(object):
+    @staticmethod
+    def formatted(timestamp_format: str = "%Y%m%d_%H%M%S") -> str:
+        """
+        Generates a timestamp in a certain format (defaulting to 'YYYYmmdd_HHMMSS') 
+        for the time when it is called
+
+        Args:
+            timestamp_format (str, optional): Format for the timestamp. Defaults to "%Y%m%d_%H%M%S".
+
+        Returns:
+            str: Time stamp in text form
+        """
+        return datetime.fromtimestamp(datetime.now().timestamp()).strftime(timestamp_format)
+
+
+class _ProfiledSection(object):
+    """
+    Context manager measuring one execution of a `Profiler` section
+    """
+    __slots__ = ("_name", "_wall", "_cpu", "_mem")
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __enter__(self):
+        self._mem = tracemalloc.get_traced_memory()[0] if Profiler.trace_memory else 0
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _wall_end = time.perf_counter()
+        _cpu = time.thread_time() - self._cpu
+        _mem = tracemalloc.get_traced_memory()[0] - self._mem if Profiler.trace_memory else 0
+        Profiler._record(self._name, self._wall, _wall_end, _cpu, _mem)
+        return False
+
+
+class _NullSection(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class Profiler(object):
+    """
+    Hot-path instrumentation. Named sections record call count, wall time, CPU time (of the
+    calling thread) and, opt-in through tracemalloc, net allocated bytes. Every thread writes
+    to its own registry, so recording takes no lock; registries are only merged when a
+    summary or trace is requested. While disabled, `section` returns a shared no-op context
+    manager and `timed` functions only pay one flag check.
+
+    Usage:
+        Profiler.enable()
+        with Profiler.section("histeq"):
+            ...
+        @Profiler.timed("p1.darkenImg")
+        def darkenImg(im, p=2): ...
+        Profiler.log_summary(); Profiler.dump_chrome_trace("trace.json")
+    """
+    enabled: bool = False
+    trace_memory: bool = False
+    chrome_trace: bool = False
+    _started_tracemalloc: bool = False  # only stop tracing we started, not the caller's
+    _local = threading.local()
+    _registries: list = []
+    _registries_lock = threading.Lock()
+    _null_section = _NullSection()
+    _t0 = time.perf_counter()
+
+    @classmethod
+    def enable(cls, trace_memory: bool = False, chrome_trace: bool = False):
+        """
+        Starts recording
+
+        Args:
+            trace_memory (bool, optional): Record allocated bytes with tracemalloc (slows the
+                whole program down while on). Defaults to False.
+            chrome_trace (bool, optional): Keep every section execution as a trace event for
+                `dump_chrome_trace`. Defaults to False.
+        """
+        cls.trace_memory = trace_memory
+        cls.chrome_trace = chrome_trace
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            cls._started_tracemalloc = True
+        elif not trace_memory and cls._started_tracemalloc:
+            tracemalloc.stop()
+            cls._started_tracemalloc = False
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        """
+        Stops recording (collected data is kept), and tracemalloc if `enable` started it
+        """
+        cls.enabled = False
+        if cls._started_tracemalloc:
+            tracemalloc.stop()
+            cls._started_tracemalloc = False
+        cls.trace_memory = False
+
+    @classmethod
+    def reset(cls):
+        """
+        Drops everything recorded so far, in every thread
+        """
+        with cls._registries_lock:
+            for _stats, _events in cls._registries:
+                _stats.clear()
+                _events.clear()
+        cls._t0 = time.perf_counter()
+
+    @classmethod
+    def _registry(cls) -> tuple:
+        _reg = getattr(cls._local, "registry", None)
+        if _reg is None:
+            _reg = ({}, [])
+            cls._local.registry = _reg
+            with cls._registries_lock:
+                cls._registries.append(_reg)
+        return _reg
+
+    @classmethod
+    def _record(cls, name: str, start: float, end: float, cpu: float, mem: int):
+        _stats, _events = cls._registry()
+        _entry = _stats.get(name)
+        if _entry is None:
+            _stats[name] = [1, end - start, cpu, mem]
+        else:
+            _entry[0] += 1
+            _entry[1] += end - start
+            _entry[2] += cpu
+            _entry[3] += mem
+        if cls.chrome_trace:
+            _events.append((name, start, end, threading.get_ident()))
+
+    @classmethod
+    def section(cls, name: str):
+        """
+        Context manager measuring the enclosed block as section `name`
+        """
+        if not cls.enabled:
+            return cls._null_section
+        return _ProfiledSection(name)
+
+    @classmethod
+    def timed(cls, name: Optional[str] = None):
+        """
+        Decorator measuring every call of a function as section `name` (its qualified name
+        if None)
+        """
+        def _decorator(func):
+            _name = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def _wrapper(*args, **kwargs):
+                if not cls.enabled:
+                    return func(*args, **kwargs)
+                with _ProfiledSection(_name):
+                    return func(*args, **kwargs)
+            return _wrapper
+        return _decorator
+
+    @classmethod
+    def summary(cls) -> dict:
+        """
+        Merged statistics of every thread
+
+        Returns:
+            dict: {section: {"calls", "wall_s", "cpu_s", "alloc_bytes"}}
+        """
+        _merged: dict = {}
+        with cls._registries_lock:
+            _registries = list(cls._registries)
+        for _stats, _ in _registries:
+            for _name, (_calls, _wall, _cpu, _mem) in list(_stats.items()):
+                _acc = _merged.setdefault(_name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "alloc_bytes": 0})
+                _acc["calls"] += _calls
+                _acc["wall_s"] += _wall
+                _acc["cpu_s"] += _cpu
+                _acc["alloc_bytes"] += _mem
+        return _merged
+
+    @classmethod
+    def summary_table(cls) -> str:
+        """
+        Summary as a text table, sections sorted by total wall time
+
+        Returns:
+            str: Table
+        """
+        _rows = sorted(cls.summary().items(), key=lambda item: item[1]["wall_s"], reverse=True)
+        _lines = [f"{'section':<40} {'calls':>10} {'wall [ms]':>12} {'cpu [ms]':>12} "
+                  f"{'per call [us]':>14} {'alloc [KiB]':>12}"]
+        for _name, _st in _rows:
+            _lines.append(f"{_name[:40]:<40} {_st['calls']:>10} {_st['wall_s'] * 1e3:>12.3f} "
+                          f"{_st['cpu_s'] * 1e3:>12.3f} {_st['wall_s'] / _st['calls'] * 1e6:>14.2f} "
+                          f"{_st['alloc_bytes'] / 1024:>12.1f}")
+        return "\n".join(_lines)
+
+    @classmethod
+    def log_summary(cls, level: int = log.INFO):
+        """
+        Logs `summary_table`
+        """
+        log.log(level, "Profiler summary\n" + cls.summary_table())
+
+    @classmethod
+    def dump_chrome_trace(cls, file_path: str) -> str:
+        """
+        Writes the recorded section executions (needs `enable(chrome_trace=True)`) in Chrome
+        trace event format, viewable in chrome://tracing or Perfetto
+
+        Args:
+            file_path (str): Output JSON file
+
+        Returns:
+            str: file_path
+        """
+        _pid = os.getpid()
+        with cls._registries_lock:
+            _registries = list(cls._registries)
+        _events = [{"name": _name, "ph": "X", "pid": _pid, "tid": _tid,
+                    "ts": (_start - cls._t0) * 1e6, "dur": (_end - _start) * 1e6}
+                   for _, _evts in _registries for _name, _start, _end, _tid in list(_evts)]
+        with open(file_path, "w") as file:
+            json.dump({"traceEvents": _events, "displayTimeUnit": "ms"}, file)
+        return file_path
+
+
+class Serializable(FileManagement):
+    """
+    Abstract class for classes that have to be serializable. Includes methods for working with
+    text JSONs, as well as some extra comodity methods for excluding private elements from 
+    those JSON strings, passing a reference to the possible outer class of an inner one, and a
+    config dialog (most of the abstract methods comming empty)
+
+    Encoding goes through a pluggable backend (see `SERIALIZER_BACKEND`): stdlib `json`
+    (default, indented unless `compact`), `orjson` or `msgpack` when installed. NumPy arrays
+    are stored natively as `{"__ndarray__", "dtype", "shape"}` objects, with the raw buffer
+    base64-encoded in JSON and as a binary blob in msgpack.
+    """
+    _outer: Any = field(default=None)
+    _public_fields_cache: dict = {}
+
+    BINARY_MAGIC = b"SRLZBIN1"
+    BINARY_ALIGNMENT = 64
+
+    @staticmethod
+    def _public_fields(obj: Any) -> tuple:
+        """
+        Public attribute names of an object, cached per class so the filtering is done once
+        instead of on every serialization. The cached names are only reused when the object
+        holds exactly the same attribute names (a set comparison against the dict keys view,
+        no per-call tuple), else they are recomputed for its layout.
+        """
+        _dict = obj.__dict__
+        _cached = Serializable._public_fields_cache.get(type(obj))
+        if _cached is not None and _dict.keys() == _cached[0]:
+            return _cached[1]
+        _fields = tuple(key for key in _dict if key[0] != "_")
+        Serializable._public_fields_cache[type(obj)] = (frozenset(_dict), _fields)
+        return _fields
+
+    def exclude_private(self) -> dict:
+        """
+        Excludes private properties from dictionary for JSON serialization
+
+        :return: (dict) Filtered dictionary
+        """
+        _dict = self.__dict__
+        return {key: _dict[key] for key in self._public_fields(self)}
+
+    @staticmethod
+    def _encode_default(o: Any, binary: bool = False) -> Any:
+        """
+        `default` hook for the backends: arrays, NumPy scalars and nested serializable objects
+        """
+        if isinstance(o, np.ndarray):
+            _arr = np.ascontiguousarray(o).reshape(o.shape)  # ascontiguousarray makes 0-d 1-d
+            _buf = _arr.tobytes()
+            return {"__ndarray__": _buf if binary else base64.b64encode(_buf).decode("ascii"),
+                    "dtype": _arr.dtype.str,
+                    "shape": list(_arr.shape)}
+        if isinstance(o, np.generic):
+            return o.item()
+        if hasattr(o, "exclude_private"):
+            return o.exclude_private()
+        raise TypeError(f"Object of type {type(o).__name__} is not serializable")
+
+    @staticmethod
+    def _decode_hook(d: dict) -> Any:
+        """
+        `object_hook` for the backends, rebuilds arrays encoded by `_encode_default`
+        """
+        if "__ndarray__" not in d:
+            return d
+        _buf = d["__ndarray__"]
+        if isinstance(_buf, str):
+            _buf = base64.b64decode(_buf)
+        return np.frombuffer(_buf, dtype=np.dtype(d["dtype"])).reshape(d["shape"]).copy()
+
+    @classmethod
+    def _decode_tree(cls, obj: Any) -> Any:
+        """
+        Applies `_decode_hook` bottom-up, for backends without an `object_hook`
+        """
+        if isinstance(obj, dict):
+            return cls._decode_hook({key: cls._decode_tree(val) for key, val in obj.items()})
+        if isinstance(obj, list):
+            return [cls._decode_tree(val) for val in obj]
+        return obj
+
+    @staticmethod
+    def _resolve_backend(backend: Optional[str], file_path: Optional[str] = None) -> str:
+        """
+        Picks the backend to use: the requested one, else the one matching the file extension,
+        else stdlib JSON. Falls back to stdlib JSON if the requested one is not installed.
+        """
+        if backend is None and file_path is not None:
+            backend = DICT_serializer_backend_extensions.get(file_path.split(".")[-1].lower())
+        if backend is None:
+            return SERIALIZER_BACKEND.Json
+        if backend == SERIALIZER_BACKEND.Auto:
+            return SERIALIZER_BACKEND.OrJson if orjson._lazy_available() else SERIALIZER_BACKEND.Json
+        if backend == SERIALIZER_BACKEND.OrJson and not orjson._lazy_available():
+            log.warning("orjson is not installed, falling back to stdlib json")
+            return SERIALIZER_BACKEND.Json
+        if backend == SERIALIZER_BACKEND.MsgPack and not msgpack._lazy_available():
+            log.warning("msgpack is not installed, falling back to stdlib json")
+            return SERIALIZER_BACKEND.Json
+        return backend
+
+    @classmethod    # FIXME: should be private but have to fix class parity in InspectionLibEfi first
+    def from_dict(cls, self: Any) -> Optional[object]:
+        """
+        Helper class for deserializing JSONs
+
+        Args:
+            self (Any): Any type object, used to help deserialization
+        
+        Returns:
+            object: Object of current class with info from json string
+        """
+        log.warning("This class does not implement this method")
+        return None
+
+    @classmethod
+    def loads(cls, data: str | bytes, backend: Optional[str] = None) -> Any:
+        """
+        Parses a serialized string/bytes into plain Python objects (arrays already rebuilt)
+
+        Args:
+            data (str | bytes): Serialized object
+            backend (Optional[str], optional): `SERIALIZER_BACKEND` to use. Defaults to None
+                (stdlib json).
+
+        Returns:
+            Any: Parsed dictionary
+        """
+        backend = cls._resolve_backend(backend)
+        if backend == SERIALIZER_BACKEND.MsgPack:
+            return msgpack.unpackb(data, object_hook=cls._decode_hook, raw=False)
+        if backend == SERIALIZER_BACKEND.OrJson:
+            return cls._decode_tree(orjson.loads(data))
+        return json.loads(data, object_hook=cls._decode_hook)
+
+    @classmethod
+    def deserialize(cls, json_string: str | bytes, backend: Optional[str] = None) -> object:
+        """
+        Deserializes JSON string to object according to the cls.from_dict method
+
+        Args:
+            json_string (str | bytes): Serialized object
+            backend (Optional[str], optional): `SERIALIZER_BACKEND` to use. Defaults to None
+                (stdlib json).
+        
+        Returns:
+            object: Object from json
+        """
+
+        _obj: type(cls) = cls.from_dict(cls.loads(json_string, backend)) # type: ignore
         return _obj
 
-    def serialize(self) -> str:
+    def serialize(self, compact: bool = False, backend: Optional[str] = None) -> str | bytes:
         """
         Serializes object in a JSON format (excluding private parameters)
 
+        Args:
+            compact (bool, optional): Skip indentation and spaces. Defaults to False.
+            backend (Optional[str], optional): `SERIALIZER_BACKEND` to use. Defaults to None
+                (stdlib json).
+
         Returns:
-            str: Serialized object
+            str | bytes: Serialized object (bytes for the msgpack backend)
         """
-        return json.dumps(self, default=lambda o: o.exclude_private(), sort_keys=False, indent=4)
+        backend = self._resolve_backend(backend)
+        if backend == SERIALIZER_BACKEND.Binary:
+            log.error("The binary container can only be written to a file (use to_file). Aborted")
+            return None
+        if backend == SERIALIZER_BACKEND.MsgPack:
+            return msgpack.packb(self, default=lambda o: self._encode_default(o, binary=True),
+                                 use_bin_type=True)
+        if backend == SERIALIZER_BACKEND.OrJson:
+            _opts = orjson.OPT_PASSTHROUGH_DATACLASS | (0 if compact else orjson.OPT_INDENT_2)
+            return orjson.dumps(self, default=self._encode_default, option=_opts).decode("utf-8")
+        if compact:
+            return json.dumps(self, default=self._encode_default, sort_keys=False,
+                              separators=(",", ":"))
+        return json.dumps(self, default=self._encode_default, sort_keys=False, indent=4)
 
     @classmethod
-    def from_file(cls, json_file_path: str):
+    def from_file(cls, json_file_path: str, backend: Optional[str] = None, mmap_mode: Optional[str] = "r"):
         """
-        Gets JSON from file, and deserializes it to current object class
+        Gets JSON from file, and deserializes it to current object class. orjson and msgpack
+        files are memory-mapped and parsed from the mapping, without reading them into a
+        bytes object first; stdlib json has no such API, so the whole file is read.
         
         Args:
             json_file_path (str): Res to JSON file
+            backend (Optional[str], optional): `SERIALIZER_BACKEND` to use. Defaults to None
+                (chosen from the file extension).
+            mmap_mode (Optional[str], optional): Only for the binary container. `np.memmap` mode
+                for the array fields ('r' read-only, 'c' copy-on-write, 'r+' read-write), or None
+                to read them into memory. Defaults to 'r'.
         
         Returns:
             (object): Deserialized from JSON
         """
+        json_file_path = cls.path_to_python(json_file_path)
+        backend = cls._resolve_backend(backend, json_file_path)
+
+        if backend == SERIALIZER_BACKEND.Binary:
+            return cls._from_binary_file(json_file_path, mmap_mode)
+
         try:
-            with open(cls.path_to_python(json_file_path)) as file:
-                json_string = file.read()
+            file = open(json_file_path, "r" if backend == SERIALIZER_BACKEND.Json else "rb")
         except Exception as ex:
             log.error(f"Couldn't open or read '{json_file_path}' ({ex}). Aborted")
             return None
 
-        if json_string is None:
-            log.error("Text from file is None. Aborted")
-            return None
-
         json_obj = None
 
         try:
-            json_obj = cls.deserialize(json_string)
+            with file:
+                if backend == SERIALIZER_BACKEND.Json:
+                    _parsed = json.load(file, object_hook=cls._decode_hook)
+                else:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as _map, \
+                            memoryview(_map) as _view:
+                        _parsed = cls.loads(_view, backend)
+            json_obj = cls.from_dict(_parsed)
         except Exception as ex:
             log.warning(f"Failed getting object from '{json_file_path}' ({ex})")
 
@@ -851,11 +2222,14 @@ class Serializable(FileManagement):
         log.info("Deserialized object correctly")
         return json_obj
 
-    def to_file(self, file_path: str):
+    def to_file(self, file_path: str, compact: bool = False, backend: Optional[str] = None):
         """
         Saves an object onto a specified file
 
         :param file_path: (str) Res to file where to save the object, serialized as json
+        :param compact: (bool) Skip indentation and spaces
+        :param backend: (Optional[str]) `SERIALIZER_BACKEND` to use, chosen from the file
+            extension if None
         :return: (str) Returns file_path back
         """
 
@@ -867,51 +2241,667 @@ class Serializable(FileManagement):
             return None
 
         # check if path to dir existed
-        dir_path = file_path[:file_path.rfind("/")]
+        dir_path = os.path.dirname(file_path)
 
-        if not os.path.exists(dir_path):
+        if dir_path and not os.path.exists(dir_path):
             log.info(f"Dir didn't exist. Created '{dir_path}'")
             os.mkdir(dir_path)
 
-        with open(file_path, "w") as file:
-            file.write(self.serialize())
+        backend = self._resolve_backend(backend, file_path)
+        if backend == SERIALIZER_BACKEND.Binary:
+            return self._to_binary_file(file_path)
+
+        _serialized = self.serialize(compact=compact, backend=backend)
+
+        with open(file_path, "wb" if isinstance(_serialized, bytes) else "w") as file:
+            file.write(_serialized)
             log.info("Object successfully saved on file")
 
         return file_path
 
-    @classmethod
-    def config_dialog(cls):
-        """
-        Launches a configuration dialog that asks for user input for each parameter from the class. Returns an object
+    def _to_binary_file(self, file_path: str) -> Optional[str]:
         """
+        Writes the binary container: magic, header length (uint64 LE), compact JSON header with
+        the non-array fields, then every array as a raw buffer aligned to `BINARY_ALIGNMENT`.
+        Arrays (also inside nested objects) are replaced in the header by
+        `{"__array_ref__": index, "dtype", "shape", "offset"}`, offsets relative to the data
+        section, and are written straight from their memory without intermediate copies.
 
-        log.error("This class does not implement this method")
-        pass
+        Args:
+            file_path (str): Destination file
 
-    def pass_outer(self, outer):
+        Returns:
+            Optional[str]: file_path, None if it fails
         """
-        Passes outer object to inner, and stores it inside the private property 'cls._outer'
+        _arrays: list = []
+        _offset = 0
 
-        Args:
-            outer (object): Outer object
-        """
+        def _default(o: Any) -> Any:
+            nonlocal _offset
+            if not isinstance(o, np.ndarray):
+                return self._encode_default(o)
+            if o.dtype.hasobject:  # the buffer would only hold PyObject pointers
+                raise TypeError(f"object-dtype arrays ({o.dtype}) can't be stored as raw buffers")
+            _arr = np.ascontiguousarray(o).reshape(o.shape)  # ascontiguousarray makes 0-d 1-d
+            _offset = -(-_offset // self.BINARY_ALIGNMENT) * self.BINARY_ALIGNMENT
+            _ref = {"__array_ref__": len(_arrays), "dtype": _arr.dtype.str,
+                    "shape": list(_arr.shape), "offset": _offset}
+            _arrays.append((_offset, _arr))
+            _offset += _arr.nbytes
+            return _ref
 
-        self._outer = outer
+        try:
+            _header = json.dumps(self, default=_default, separators=(",", ":")).encode("utf-8")
+            _data_start = len(self.BINARY_MAGIC) + 8 + len(_header)
+            _data_start = -(-_data_start // self.BINARY_ALIGNMENT) * self.BINARY_ALIGNMENT
 
+            with open(file_path, "wb") as file:
+                file.write(self.BINARY_MAGIC)
+                file.write(len(_header).to_bytes(8, "little"))
+                file.write(_header)
+                for _arr_offset, _arr in _arrays:
+                    file.seek(_data_start + _arr_offset)
+                    if _arr.nbytes:
+                        file.write(_arr.reshape(-1).view(np.uint8).data)
+                file.truncate(_data_start + _offset)
+        except Exception as ex:
+            log.error(f"Failed writing binary container '{file_path}' ({ex})")
+            return None
 
-class Plotting(object):
-    @staticmethod
+        log.info("Object successfully saved on file")
+        return file_path
+
+    @classmethod
+    def _from_binary_file(cls, file_path: str, mmap_mode: Optional[str] = "r"):
+        """
+        Reads a binary container written by `_to_binary_file`. With a `mmap_mode` the array
+        fields are `np.memmap` views on the file, so loading costs only the header parse.
+
+        Args:
+            file_path (str): Container file
+            mmap_mode (Optional[str], optional): `np.memmap` mode, None to read into memory.
+                Defaults to 'r'.
+
+        Returns:
+            (object): Deserialized object, None if it fails
+        """
+        try:
+            with open(file_path, "rb") as file:
+                if file.read(len(cls.BINARY_MAGIC)) != cls.BINARY_MAGIC:
+                    log.error(f"'{file_path}' is not a binary serialized object. Aborted")
+                    return None
+                _header_len = int.from_bytes(file.read(8), "little")
+                _header = file.read(_header_len)
+        except Exception as ex:
+            log.error(f"Couldn't open or read '{file_path}' ({ex}). Aborted")
+            return None
+
+        _data_start = len(cls.BINARY_MAGIC) + 8 + _header_len
+        _data_start = -(-_data_start // cls.BINARY_ALIGNMENT) * cls.BINARY_ALIGNMENT
+
+        def _hook(d: dict) -> Any:
+            if "__array_ref__" not in d:
+                return cls._decode_hook(d)
+            _dtype, _shape = np.dtype(d["dtype"]), tuple(d["shape"])
+            if int(np.prod(_shape)) == 0:
+                return np.empty(_shape, dtype=_dtype)
+            if mmap_mode is None:
+                return np.fromfile(file_path, dtype=_dtype, count=int(np.prod(_shape)),
+                                   offset=_data_start + d["offset"]).reshape(_shape)
+            # np.memmap ignores shape=() (0-d arrays), map one element and reshape
+            return np.memmap(file_path, dtype=_dtype, mode=mmap_mode,
+                             offset=_data_start + d["offset"], shape=_shape or (1,)).reshape(_shape)
+
+        json_obj = None
+        try:
+            json_obj = cls.from_dict(json.loads(_header, object_hook=_hook))
+        except Exception as ex:
+            log.warning(f"Failed getting object from '{file_path}' ({ex})")
+
+        if json_obj is None:
+            log.error("Unable to deserialize binary container (is none)")
+            return None
+
+        log.info("Deserialized object correctly")
+        return json_obj
+
+    def benchmark_backends(self, n_runs: int = 20) -> dict:
+        """
+        Measures serialize + deserialize round-trip time and output size of this object for
+        every installed backend, in indented and compact modes
+
+        Args:
+            n_runs (int, optional): Round trips per backend and mode. Defaults to 20.
+
+        Returns:
+            dict: {(backend, compact): (mean seconds per round trip, size in bytes)}
+        """
+        _backends = [SERIALIZER_BACKEND.Json]
+        if orjson._lazy_available():
+            _backends.append(SERIALIZER_BACKEND.OrJson)
+        if msgpack._lazy_available():
+            _backends.append(SERIALIZER_BACKEND.MsgPack)
+
+        results = {}
+        for backend in _backends:
+            for compact in (False, True):
+                if backend == SERIALIZER_BACKEND.MsgPack and not compact:
+                    continue
+                _start = time.perf_counter()
+                for _ in range(n_runs):
+                    _data = self.serialize(compact=compact, backend=backend)
+                    self.loads(_data, backend)
+                _elapsed = (time.perf_counter() - _start) / n_runs
+                _size = len(_data if isinstance(_data, bytes) else _data.encode("utf-8"))
+                results[(backend, compact)] = (_elapsed, _size)
+                log.info(f"{backend:<8} compact={compact!s:<5} {_elapsed * 1e3:9.3f} ms {_size:>12} B")
+
+        return results
+
+    @classmethod
+    def config_dialog(cls):
+        """
+        Launches a configuration dialog that asks for user input for each parameter from the class. Returns an object
+        """
+
+        log.error("This class does not implement this method")
+        pass
+
+    def pass_outer(self, outer):
+        """
+        Passes outer object to inner, and stores it inside the private property 'cls._outer'
+
+        Args:
+            outer (object): Outer object
+        """
+
+        self._outer = outer
+
+
+class RecordLogWriter(FileManagement):
+    """
+    Append-only JSON-lines writer for streams of `Serializable` objects (one inspection event
+    per record). Every line is `{"ts": <epoch seconds>, "data": <object>}`; a sidecar
+    `<log>.idx` file stores one (offset, timestamp) pair per record so `RecordLogReader` can
+    seek to any record without parsing the log.
+
+    Records are encoded into an in-memory buffer and written every `flush_records` records;
+    `os.fsync` is batched to at most once every `fsync_interval` seconds (and on close), so
+    ingestion is not bound by disk syncs. Use it as a context manager or call `close()`.
+    """
+    INDEX_DTYPE = np.dtype([("offset", "<u8"), ("ts", "<f8")])
+
+    def __init__(self, log_path: str, flush_records: int = 1024, fsync_interval: Optional[float] = 1.0,
+                 backend: str = SERIALIZER_BACKEND.Auto):
+        """
+        Args:
+            log_path (str): Log file, created if it doesn't exist, appended to otherwise
+            flush_records (int, optional): Records buffered before writing. Defaults to 1024.
+            fsync_interval (Optional[float], optional): Minimum seconds between fsyncs, None to
+                never fsync (only flush). Defaults to 1.0.
+            backend (str, optional): JSON `SERIALIZER_BACKEND`. Defaults to Auto.
+        """
+        self._log_path = self.path_to_python(log_path)
+        self._index_path = self._log_path + ".idx"
+        self._flush_records = max(int(flush_records), 1)
+        self._fsync_interval = fsync_interval
+        self._backend = Serializable._resolve_backend(backend)
+        if self._backend not in (SERIALIZER_BACKEND.Json, SERIALIZER_BACKEND.OrJson):
+            log.warning("Record logs are JSON lines, falling back to stdlib json")
+            self._backend = SERIALIZER_BACKEND.Json
+
+        _dir = os.path.dirname(self._log_path)
+        if _dir:
+            os.makedirs(_dir, exist_ok=True)
+
+        RecordLogReader.sync_index(self._log_path, repair=True)
+        self._log_file = open(self._log_path, "ab")
+        self._index_file = open(self._index_path, "ab")
+        self._offset = self._log_file.tell()
+        self._buffer = bytearray()
+        self._pending_index: list = []
+        self._last_fsync = time.monotonic()
+        self.count = os.path.getsize(self._index_path) // self.INDEX_DTYPE.itemsize
+
+    def _encode(self, record: dict) -> bytes:
+        if self._backend == SERIALIZER_BACKEND.OrJson:
+            return orjson.dumps(record, default=Serializable._encode_default,
+                                option=orjson.OPT_PASSTHROUGH_DATACLASS)
+        return json.dumps(record, default=Serializable._encode_default,
+                          separators=(",", ":")).encode("utf-8")
+
+    def append(self, obj: Any, timestamp: Optional[float] = None):
+        """
+        Appends one record
+
+        Args:
+            obj (Any): `Serializable` object or any JSON-encodable value
+            timestamp (Optional[float], optional): Epoch seconds for the record, must not
+                decrease along the log. Defaults to None (now).
+        """
+        _ts = time.time() if timestamp is None else float(timestamp)
+        _line = self._encode({"ts": _ts, "data": obj}) + b"\n"
+        self._pending_index.append((self._offset + len(self._buffer), _ts))
+        self._buffer += _line
+        self.count += 1
+        if len(self._pending_index) >= self._flush_records:
+            self.flush()
+
+    def extend(self, objs, timestamps=None):
+        """
+        Appends several records
+
+        Args:
+            objs (Iterable): Objects to append
+            timestamps (Optional[Iterable[float]], optional): One timestamp per object.
+                Defaults to None (now).
+        """
+        if timestamps is None:
+            for obj in objs:
+                self.append(obj)
+        else:
+            for obj, ts in zip(objs, timestamps):
+                self.append(obj, ts)
+
+    def flush(self, force_fsync: bool = False):
+        """
+        Writes the buffered records and their index entries, fsyncing if the interval elapsed
+
+        Args:
+            force_fsync (bool, optional): fsync regardless of the interval. Defaults to False.
+        """
+        if self._buffer:
+            # log first, so an index entry never points past the end of the log
+            self._log_file.write(self._buffer)
+            self._log_file.flush()
+            self._offset += len(self._buffer)
+            self._buffer = bytearray()
+            self._index_file.write(np.array(self._pending_index, dtype=self.INDEX_DTYPE).tobytes())
+            self._index_file.flush()
+            self._pending_index = []
+
+        _now = time.monotonic()
+        if force_fsync or (self._fsync_interval is not None and _now - self._last_fsync >= self._fsync_interval):
+            os.fsync(self._log_file.fileno())
+            os.fsync(self._index_file.fileno())
+            self._last_fsync = _now
+
+    def close(self):
+        """
+        Flushes, fsyncs and closes the log
+        """
+        if self._log_file.closed:
+            return
+        self.flush(force_fsync=self._fsync_interval is not None)
+        self._log_file.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class RecordLogReader(FileManagement):
+    """
+    Random-access reader for logs written by `RecordLogWriter`. The `.idx` sidecar is loaded
+    as a NumPy array, so record N or a timestamp range is found without touching the rest of
+    the log; only the requested lines are read and parsed. A missing or stale index (e.g. after
+    a crash, or records of a live writer not indexed yet) is completed in memory on open.
+    The reader never modifies the log or its index, so it is safe to open next to a running
+    writer; repairs are left to the writer, when it opens the log.
+    """
+    def __init__(self, log_path: str, record_cls: Optional[type] = None):
+        """
+        Args:
+            log_path (str): Log file
+            record_cls (Optional[type], optional): `Serializable` subclass whose `from_dict`
+                builds each record, plain dicts are returned if None. Defaults to None.
+        """
+        self._log_path = self.path_to_python(log_path)
+        self._record_cls = record_cls
+        self._log_file = open(self._log_path, "rb")
+        self._index = self.sync_index(self._log_path)
+
+    @staticmethod
+    def sync_index(log_path: str, repair: bool = False) -> np.ndarray:
+        """
+        Index covering every complete line of the log: drops entries past the end of the log
+        or pointing at a partial line, and indexes unindexed lines by parsing them. Only the
+        unindexed tail of the log is read. A partial last line (being written, or left by a
+        crash) is ignored.
+
+        Args:
+            log_path (str): Log file
+            repair (bool, optional): Also truncate a partial last line and rewrite `<log>.idx`
+                (creating both files if missing). Only for the writer, on open: with a writer
+                running it would corrupt the log. Defaults to False.
+
+        Returns:
+            np.ndarray: Index, structured array with `offset` and `ts` fields
+        """
+        _index_path = log_path + ".idx"
+        _dtype = RecordLogWriter.INDEX_DTYPE
+        if not os.path.exists(log_path):
+            if repair:
+                open(log_path, "ab").close()
+                open(_index_path, "wb").close()
+            return np.empty(0, dtype=_dtype)
+
+        _log_size = os.path.getsize(log_path)
+        _index = np.empty(0, dtype=_dtype)
+        _on_disk = -1
+        if os.path.exists(_index_path):
+            _on_disk = os.path.getsize(_index_path) // _dtype.itemsize
+            _index = np.fromfile(_index_path, dtype=_dtype, count=_on_disk)
+            _index = _index[_index["offset"] < _log_size]
+
+        _new = []
+        with open(log_path, "r+b" if repair else "rb") as file:
+            _pos = 0
+            if _index.size:
+                file.seek(int(_index["offset"][-1]))
+                _last = file.readline()
+                if not _last.endswith(b"\n"):
+                    _index = _index[:-1]
+                    _pos = int(file.tell() - len(_last))
+                else:
+                    _pos = file.tell()
+            file.seek(_pos)
+            for _line in iter(file.readline, b""):
+                if not _line.endswith(b"\n"):
+                    if repair:
+                        log.warning(f"Dropping partial record at the end of '{log_path}'")
+                        file.truncate(_pos)
+                    break
+                _new.append((_pos, json.loads(_line)["ts"]))
+                _pos += len(_line)
+
+        if _new:
+            log.debug(f"Indexed {len(_new)} unindexed records of '{log_path}'")
+            _index = np.concatenate((_index, np.array(_new, dtype=_dtype)))
+        if repair and _index.size != _on_disk:
+            _index.tofile(_index_path)
+        return _index
+
+    def __len__(self) -> int:
+        return self._index.size
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """
+        np.ndarray: Timestamp of every record
+        """
+        return self._index["ts"]
+
+    def _decode(self, line: bytes) -> Any:
+        _data = Serializable.loads(line, SERIALIZER_BACKEND.Auto)["data"]
+        return self._record_cls.from_dict(_data) if self._record_cls is not None else _data
+
+    def read_raw(self, n: int) -> bytes:
+        """
+        Raw JSON line of record `n` (negative indices count from the end)
+        """
+        self._log_file.seek(int(self._index["offset"][n]))
+        return self._log_file.readline()
+
+    def read(self, n: int) -> Any:
+        """
+        Decoded record `n` (negative indices count from the end)
+        """
+        return self._decode(self.read_raw(n))
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None):
+        """
+        Yields the records in [start, stop) reading the log sequentially from `start`
+        """
+        _offsets = self._index["offset"][start:stop]
+        if _offsets.size == 0:
+            return
+        self._log_file.seek(int(_offsets[0]))
+        for _ in range(_offsets.size):
+            yield self._decode(self._log_file.readline())
+
+    def time_range(self, t_start: Optional[float] = None, t_stop: Optional[float] = None):
+        """
+        Yields the records with `t_start <= ts < t_stop`, located by binary search on the index
+
+        Args:
+            t_start (Optional[float], optional): Epoch seconds, open if None. Defaults to None.
+            t_stop (Optional[float], optional): Epoch seconds, open if None. Defaults to None.
+        """
+        _ts = self._index["ts"]
+        _start = 0 if t_start is None else int(np.searchsorted(_ts, t_start, side="left"))
+        _stop = _ts.size if t_stop is None else int(np.searchsorted(_ts, t_stop, side="left"))
+        yield from self.iter_records(_start, _stop)
+
+    def close(self):
+        self._log_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class UnifDataLoader(FileManagement):
+    """
+    Loader for uniformity data sources (`UNIF_DATA_SOURCE_TYPE`). Files are split into byte
+    ranges aligned to line boundaries and every range is parsed by the parser registered for
+    the source type, in a process pool when the file is big enough to be worth it. Results
+    are concatenated in file order into a DataFrame with consistent dtypes (every numeric
+    column as float64), and the throughput is logged and kept in `df.attrs`.
+
+    | Source | Parser | Rows |
+    |---|---|---|
+    | `UNIF_DATA_SOURCE_TYPE.FieryClrUniX` | `_parse_clrunix` | Whitespace separated numeric rows, others skipped |
+    | `UNIF_DATA_SOURCE_TYPE.EISJson` | `_parse_json_lines` | JSON object found in each log line, flattened |
+    | `UNIF_DATA_SOURCE_TYPE.AVTJson` | `_parse_json_lines` | JSON object found in each log line, flattened |
+    """
+    _parsers: dict = {}
+
+    @classmethod
+    def register_parser(cls, source_type: str, parser):
+        """
+        Registers (or replaces) the parser for a source type. Parsers receive the lines of one
+        byte range (`list[bytes]`) and return a DataFrame; they must be picklable (module-level
+        functions or static methods) to run in the process pool.
+
+        Args:
+            source_type (str): `UNIF_DATA_SOURCE_TYPE` value
+            parser (Callable[[list[bytes]], pd.DataFrame]): Parser
+        """
+        cls._parsers[source_type] = parser
+
+    @staticmethod
+    def _parse_clrunix(lines: list) -> pd.DataFrame:
+        _rows = []
+        for _line in lines:
+            _tokens = _line.split()
+            if not _tokens:
+                continue
+            try:
+                _rows.append([float(tok) for tok in _tokens])
+            except ValueError:
+                continue  # headers and comments
+        if not _rows:
+            return pd.DataFrame()
+        _width = max(len(row) for row in _rows)
+        _data = np.full((len(_rows), _width), np.nan)
+        for i, row in enumerate(_rows):
+            _data[i, :len(row)] = row
+        return pd.DataFrame(_data)
+
+    @staticmethod
+    def _parse_json_lines(lines: list) -> pd.DataFrame:
+        _loads = orjson.loads if orjson._lazy_available() else json.loads
+        _records = []
+        for _line in lines:
+            _start, _end = _line.find(b"{"), _line.rfind(b"}")
+            if _start < 0 or _end < _start:
+                continue
+            try:
+                _records.append(_loads(_line[_start:_end + 1]))
+            except ValueError:
+                log.debug(f"Skipped malformed log line ({_line[:60]!r})")
+        return pd.json_normalize(_records) if _records else pd.DataFrame()
+
+    @staticmethod
+    def _split_ranges(file_path: str, chunk_size: int) -> list:
+        _size = os.path.getsize(file_path)
+        return [(start, min(start + chunk_size, _size)) for start in range(0, _size, chunk_size)]
+
+    @staticmethod
+    def _parse_range(file_path: str, start: int, end: int, parser) -> pd.DataFrame:
+        """
+        Parses the lines that begin inside [start, end): a line cut by `start` belongs to the
+        previous range, a line cut by `end` is read to its end
+        """
+        _lines = []
+        with open(file_path, "rb") as file:
+            if start > 0:
+                file.seek(start - 1)
+                file.readline()  # skip to the first line beginning at or after start
+            _pos = file.tell()
+            while _pos < end:
+                _line = file.readline()
+                if not _line:
+                    break
+                _lines.append(_line)
+                _pos += len(_line)
+        return parser(_lines)
+
+    @staticmethod
+    def _normalize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        for _col in df.columns:
+            if pd.api.types.is_bool_dtype(df[_col]):
+                continue
+            if pd.api.types.is_numeric_dtype(df[_col]):
+                df[_col] = df[_col].astype(np.float64)
+        return df
+
+    @classmethod
+    def load(cls, file_path: str, source_type: str, n_workers: Optional[int] = None,
+             chunk_size: int = 32 << 20) -> pd.DataFrame:
+        """
+        Loads a uniformity data file
+
+        Args:
+            file_path (str): File to load
+            source_type (str): `UNIF_DATA_SOURCE_TYPE` of the file
+            n_workers (Optional[int], optional): Worker processes, `os.cpu_count()` if None;
+                1 parses in the calling process. Defaults to None.
+            chunk_size (int, optional): Bytes per range. Defaults to 32 MiB.
+
+        Returns:
+            pd.DataFrame: Parsed data, `df.attrs` holds `bytes`, `seconds` and `MBps`
+        """
+        file_path = cls.path_to_python(file_path)
+        if source_type not in cls._parsers:
+            log.error(f"No parser registered for source type '{source_type}'")
+            return None
+
+        _parser = cls._parsers[source_type]
+        _ranges = cls._split_ranges(file_path, max(int(chunk_size), 1))
+        n_workers = min(n_workers or os.cpu_count() or 1, max(len(_ranges), 1))
+
+        _start = time.perf_counter()
+        if n_workers <= 1:
+            _frames = [cls._parse_range(file_path, a, b, _parser) for a, b in _ranges]
+        else:
+            with futures.ProcessPoolExecutor(max_workers=n_workers) as pool:
+                _frames = list(pool.map(cls._parse_range, [file_path] * len(_ranges),
+                                        [a for a, _ in _ranges], [b for _, b in _ranges],
+                                        [_parser] * len(_ranges)))
+        _frames = [frame for frame in _frames if not frame.empty]
+        df = cls._normalize_dtypes(pd.concat(_frames, ignore_index=True)) if _frames else pd.DataFrame()
+        _elapsed = time.perf_counter() - _start
+
+        _bytes = _ranges[-1][1] if _ranges else 0
+        df.attrs.update({"bytes": _bytes, "seconds": _elapsed,
+                         "MBps": _bytes / 1e6 / _elapsed if _elapsed else float("inf")})
+        log.info(f"Parsed '{file_path}' ({_bytes / 1e6:.1f} MB, {len(df)} rows) in {_elapsed:.2f} s "
+                 f"with {n_workers} worker(s): {df.attrs['MBps']:.1f} MB/s")
+        return df
+
+
+UnifDataLoader.register_parser(UNIF_DATA_SOURCE_TYPE.FieryClrUniX, UnifDataLoader._parse_clrunix)
+UnifDataLoader.register_parser(UNIF_DATA_SOURCE_TYPE.EISJson, UnifDataLoader._parse_json_lines)
+UnifDataLoader.register_parser(UNIF_DATA_SOURCE_TYPE.AVTJson, UnifDataLoader._parse_json_lines)
+
+
+class Plotting(object):
+    @staticmethod
+    def decimate_minmax(x: np.ndarray, y: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Reduces a signal to the minimum and maximum of each of `n_buckets` consecutive buckets
+        (kept in their original order), so a line plot of the result looks the same as the full
+        signal at that width, peaks included
+
+        Args:
+            x (np.ndarray): X values
+            y (np.ndarray): Y values
+            n_buckets (int): Buckets, usually the plot width in pixels
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Decimated (x, y), unchanged if already small enough
+        """
+        _x, _y = np.asarray(x), np.asarray(y)
+        if n_buckets <= 0 or _y.size <= 2 * n_buckets:
+            return _x, _y
+
+        _size = -(-_y.size // n_buckets)
+        _n_full = _y.size // _size
+        _body = _y[:_n_full * _size].reshape(_n_full, _size)
+        _offsets = np.arange(_n_full) * _size
+        _lo = [_offsets + np.argmin(_body, axis=1)]
+        _hi = [_offsets + np.argmax(_body, axis=1)]
+        if _n_full * _size < _y.size:
+            _tail = _y[_n_full * _size:]
+            _lo.append([_n_full * _size + int(np.argmin(_tail))])
+            _hi.append([_n_full * _size + int(np.argmax(_tail))])
+        _lo, _hi = np.concatenate(_lo), np.concatenate(_hi)
+
+        _idx = np.empty(2 * _lo.size, dtype=np.int64)
+        _idx[0::2] = np.minimum(_lo, _hi)
+        _idx[1::2] = np.maximum(_lo, _hi)
+        return _x[_idx], _y[_idx]
+
+    @staticmethod
     def plotSetOfSignals(signal_set: list[np.ndarray], signal_colors: list[str], x_signal_set: Optional[list[np.ndarray]] = None, signal_names: Optional[List[str]] = None,
                          plot_title: Optional[str] = None, x_axis_title: Optional[str] = None, y_axis_title: Optional[str] = None, figsize: Optional[tuple[int, int]] = None,
-                         alphas = None, dump_plot_path: Optional[str] = None, show_plot = True):
-                        
-        if figsize is not None:
-            plt.figure(figsize=figsize)
-            
+                         alphas = None, dump_plot_path: Optional[str] = None, show_plot = True,
+                         decimate: bool = True, dpi: Optional[float] = None):
+        """
+        Plots a set of signals on the same axes, optionally dumping the figure to a file.
+
+        Long signals are reduced with `decimate_minmax` to about two points per horizontal
+        pixel before plotting. When the plot is only dumped (`show_plot=False` with a
+        `dump_plot_path`), it is drawn on a standalone Agg figure, bypassing pyplot's global
+        state, and released afterwards.
+
+        Args:
+            signal_set (list[np.ndarray]): Y values of every signal
+            signal_colors (list[str]): Color of every signal
+            x_signal_set (Optional[list[np.ndarray]], optional): X values of every signal,
+                sample indices if None. Defaults to None.
+            signal_names (Optional[List[str]], optional): Legend labels. Defaults to None.
+            plot_title (Optional[str], optional): Title. Defaults to None ("Plot").
+            x_axis_title (Optional[str], optional): X label. Defaults to None ("X axis").
+            y_axis_title (Optional[str], optional): Y label. Defaults to None ("Y axis").
+            figsize (Optional[tuple[int, int]], optional): Figure size (inches). Defaults to None.
+            alphas (optional): Alpha for all signals or one per signal. Defaults to None (1).
+            dump_plot_path (Optional[str], optional): File where to save the figure. Defaults to None.
+            show_plot (bool, optional): Show the figure. Defaults to True.
+            decimate (bool, optional): Apply min/max decimation to the figure width. Defaults to True.
+            dpi (Optional[float], optional): Figure dpi, matplotlib's default if None. Defaults to None.
+        """
         if x_signal_set is None:
             log.warning("x set validations failed, defaulting to linspace...")
-            x_signal_set = [range(len(signal_set[0])) for signal in signal_set]                
-        
+            x_signal_set = [np.arange(len(signal)) for signal in signal_set]
+
         if not isinstance(alphas, list) or alphas is None:
             if isinstance(alphas, int) or isinstance(alphas, float):
                 alphas = np.ones(len(signal_set)) * alphas
@@ -919,64 +2909,1416 @@ class Plotting(object):
                 alphas = np.ones(len(signal_set))
         elif len(alphas) != len(signal_set):
                 alphas = np.ones(len(signal_set)) * alphas[0]
-        
+
+        if signal_names is None:
+            signal_names = [None] * len(signal_set)
+
         if plot_title is None:
             plot_title = "Plot"
-        
+
         if x_axis_title is None:
             x_axis_title = "X axis"
-            
+
         if y_axis_title is None:
-            y_axis_title = "X axis"
-        
-        for signal in range(len(signal_set)):
-            plt.plot(x_signal_set[signal], signal_set[signal], label=signal_names[signal], color=signal_colors[signal], alpha=alphas[signal])
-        
-        plt.legend()
-        plt.title(plot_title)
-        plt.xlabel(x_axis_title)
-        plt.ylabel(y_axis_title)
-        
+            y_axis_title = "Y axis"
+
+        if not show_plot and dump_plot_path is not None:
+            _renderer = FigureRenderer(figsize=figsize, dpi=dpi)
+            _ax = _renderer.axes(1, 1)[0, 0]
+            Plotting._drawSignals(_ax, signal_set, signal_colors, x_signal_set, signal_names, plot_title,
+                                  x_axis_title, y_axis_title, alphas, decimate)
+            _renderer.save(dump_plot_path)
+            return
+
+        if figsize is not None or dpi is not None:
+            plt.figure(figsize=figsize, dpi=dpi)
+        Plotting._drawSignals(plt.gca(), signal_set, signal_colors, x_signal_set, signal_names, plot_title,
+                              x_axis_title, y_axis_title, alphas, decimate)
+
         if dump_plot_path is not None:
             plt.savefig(dump_plot_path)
-        
+
         if show_plot:
             plt.show()
-        
-        return
 
+        return
 
-class DataDumping():
     @staticmethod
-    def dump_matrix_to_file(matrix: list[list], output_path: str, index = False):
-         df = pd.DataFrame(np.transpose(matrix), columns=[i for i in range(len(matrix))])
-         df.to_excel(output_path, index=index)
+    def _drawSignals(ax, signal_set, signal_colors, x_signal_set, signal_names, plot_title,
+                     x_axis_title, y_axis_title, alphas, decimate: bool):
+        """
+        Draws already validated `plotSetOfSignals` arguments onto an Axes
+        """
+        _fig = ax.get_figure()
+        _n_buckets = int(_fig.get_figwidth() * _fig.dpi) if decimate else 0
 
+        for signal in range(len(signal_set)):
+            _x, _y = Plotting.decimate_minmax(x_signal_set[signal], signal_set[signal], _n_buckets)
+            ax.plot(_x, _y, label=signal_names[signal], color=signal_colors[signal], alpha=alphas[signal])
 
-class DescriptiveStrPrint(object):
-    pass
+        if any(name is not None for name in signal_names):
+            ax.legend()
+        ax.set_title(plot_title)
+        ax.set_xlabel(x_axis_title)
+        ax.set_ylabel(y_axis_title)
 
+    @staticmethod
+    def renderPlotsToFiles(jobs: list[dict], n_workers: Optional[int] = None) -> list[Optional[str]]:
+        """
+        Renders a batch of `plotSetOfSignals` calls to image files in a process pool, through
+        the headless Agg path
 
-class SqlMethods(object):
-    cursor: sql.Cursor
-    
-    def __init__(path):
-        #create connection and cursor
-        pass
-    
-    def getColumnsFromTable(self, columns:list[str]):
-        pass
-    
-    def getAllFromTable(self):
-        pass
+        Args:
+            jobs (list[dict]): Keyword arguments of every `plotSetOfSignals` call, each with a
+                `dump_plot_path`
+            n_workers (Optional[int], optional): Worker processes, `os.cpu_count()` if None;
+                1 renders in the calling process. Defaults to None.
+
+        Returns:
+            list[Optional[str]]: Written path of every job (None for the ones that failed)
+        """
+        return FigureRenderer.render_batch([(FIGURE_JOB.Signals, job) for job in jobs], n_workers)
 
 
-def betterPrint(msg:str, color: str):
-    """_summary_
+class FigureRenderer(object):
+    """
+    Headless figure renderer for batch report generation. Draws through the object-oriented
+    `Figure` API on an Agg canvas (never through pyplot, so no figure is registered or leaked
+    and nothing blocks), and reuses the same Figure and Axes across calls: axes are only
+    cleared while the grid shape stays the same. `render_batch` spreads jobs across worker
+    processes, each keeping its own renderer for its whole life.
 
-    Args:
-        msg (str): Message to print
-        color (str): Color information
+    Offers headless counterparts of `Plotting.plotSetOfSignals` and of the lab
+    `visualPercepUtils.showInGrid` / `showInFigs`, writing straight to files.
     """
-    print(f"{color}{msg}{BCOLORS.ENDC}")
-    return
\ No newline at end of file
+    _process_renderer = None
+
+    def __init__(self, figsize: Optional[tuple[float, float]] = None, dpi: Optional[float] = None):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self._figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self._figure)
+        self._default_size = tuple(self._figure.get_size_inches())
+        self._default_dpi = self._figure.dpi
+        self._grid = None
+        self._axes = None
+
+    @property
+    def figure(self):
+        return self._figure
+
+    def axes(self, m: int = 1, n: int = 1, figsize: Optional[tuple[float, float]] = None) -> np.ndarray:
+        """
+        Clean (m, n) grid of Axes, reusing the current ones when the shape matches
+
+        Args:
+            m (int, optional): Rows. Defaults to 1.
+            n (int, optional): Columns. Defaults to 1.
+            figsize (Optional[tuple[float, float]], optional): Figure size for this drawing,
+                the renderer's default if None. Defaults to None.
+
+        Returns:
+            np.ndarray: 2D array of Axes
+        """
+        self._figure.set_size_inches(figsize if figsize is not None else self._default_size)
+        if self._grid != (m, n):
+            self._figure.clear()
+            self._axes = self._figure.subplots(m, n, squeeze=False)
+            self._grid = (m, n)
+        else:
+            for _ax in self._axes.flat:
+                _ax.clear()
+                _ax.set_visible(True)
+        self._figure.suptitle("")
+        return self._axes
+
+    def save(self, file_path: str, **kwargs) -> str:
+        """
+        Writes the current drawing to a file (format from the extension)
+        """
+        self._figure.savefig(file_path, **kwargs)
+        return file_path
+
+    def render_signals(self, dump_plot_path: str, **kwargs) -> str:
+        """
+        Headless `Plotting.plotSetOfSignals` (same keyword arguments) on the reused Figure.
+        A given dpi only applies to this drawing (and its decimation), the renderer's is
+        restored afterwards.
+        """
+        _args = dict(x_signal_set=None, signal_names=None, plot_title=None, x_axis_title=None,
+                     y_axis_title=None, alphas=None, decimate=True)
+        _args.update(kwargs)
+        _args.pop("show_plot", None)
+        _dpi = _args.pop("dpi", None)
+        _figsize = _args.pop("figsize", None)
+        _signals = _args["signal_set"]
+
+        if _args["x_signal_set"] is None:
+            _args["x_signal_set"] = [np.arange(len(signal)) for signal in _signals]
+        _alphas = _args["alphas"]
+        if isinstance(_alphas, (int, float)):
+            _args["alphas"] = [_alphas] * len(_signals)
+        elif not isinstance(_alphas, list) or len(_alphas) != len(_signals):
+            _args["alphas"] = [1.0 if not _alphas else _alphas[0]] * len(_signals)
+        if _args["signal_names"] is None:
+            _args["signal_names"] = [None] * len(_signals)
+
+        _ax = self.axes(1, 1, _figsize)[0, 0]
+        if _dpi is not None:
+            self._figure.set_dpi(_dpi)
+        try:
+            Plotting._drawSignals(_ax, _signals, _args["signal_colors"], _args["x_signal_set"],
+                                  _args["signal_names"], _args["plot_title"] or "Plot",
+                                  _args["x_axis_title"] or "X axis", _args["y_axis_title"] or "Y axis",
+                                  _args["alphas"], _args["decimate"])
+            # savefig's default dpi is the figure's original one, not the current one
+            return self.save(dump_plot_path, **({} if _dpi is None else {"dpi": _dpi}))
+        finally:
+            self._figure.set_dpi(self._default_dpi)
+
+    @staticmethod
+    def _rows_cols(N: int, m: Optional[int], n: Optional[int]) -> tuple[int, int]:
+        # same layout rule as visualPercepUtils.computeRowsCols
+        if m is None:
+            m = math.sqrt(N)
+            if n is None:
+                n = math.ceil(N / m)
+            else:
+                m = math.ceil(N / n)
+        elif n is None:
+            n = math.ceil(N / m)
+        else:
+            m = math.ceil(N / n)
+        return math.ceil(max(1, m)), math.ceil(max(1, n))
+
+    def render_grid(self, imgs: list, file_path: str, m: Optional[int] = None, n: Optional[int] = None,
+                    title: str = "", subtitles: Optional[list[str]] = None,
+                    figsize: Optional[tuple[float, float]] = None) -> str:
+        """
+        Headless `visualPercepUtils.showInGrid`: images (2D+) shown in gray, 1D data plotted
+
+        Args:
+            imgs (list): Images / 1D signals
+            file_path (str): Output file
+            m (Optional[int], optional): Rows. Defaults to None.
+            n (Optional[int], optional): Columns. Defaults to None.
+            title (str, optional): Figure title. Defaults to "".
+            subtitles (Optional[list[str]], optional): Title of every cell. Defaults to None.
+            figsize (Optional[tuple[float, float]], optional): Size, (m, n) like showInGrid
+                if None. Defaults to None.
+
+        Returns:
+            str: file_path
+        """
+        m, n = self._rows_cols(len(imgs), m, n)
+        _axes = self.axes(m, n, figsize if figsize is not None else (m, n)).flat
+        for i, _ax in enumerate(_axes):
+            if i >= len(imgs):
+                _ax.set_visible(False)
+                continue
+            if len(np.shape(imgs[i])) >= 2:
+                _ax.imshow(imgs[i], cmap="gray")
+            else:
+                _ax.plot(imgs[i])
+            if subtitles is not None:
+                _ax.set_title(subtitles[i])
+        self._figure.suptitle(title)
+        return self.save(file_path)
+
+    def render_figs(self, imgs: list, file_paths: list[str], title: str = "") -> list[str]:
+        """
+        Headless `visualPercepUtils.showInFigs`: every image to its own file
+
+        Args:
+            imgs (list): Images
+            file_paths (list[str]): One output file per image
+            title (str, optional): Title of every figure. Defaults to "".
+
+        Returns:
+            list[str]: file_paths
+        """
+        for _im, _path in zip(imgs, file_paths):
+            _ax = self.axes(1, 1)[0, 0]
+            _ax.imshow(_im, cmap="gray", interpolation=None)
+            _ax.set_title(title)
+            self.save(_path)
+        return list(file_paths)
+
+    def render(self, kind: str, kwargs: dict):
+        """
+        Runs one `FIGURE_JOB` with its keyword arguments
+        """
+        if kind == FIGURE_JOB.Signals:
+            return self.render_signals(**kwargs)
+        if kind == FIGURE_JOB.Grid:
+            return self.render_grid(**kwargs)
+        if kind == FIGURE_JOB.Figs:
+            return self.render_figs(**kwargs)
+        raise ValueError(f"Unknown figure job '{kind}'")
+
+    @classmethod
+    def _render_in_process(cls, job: tuple):
+        if cls._process_renderer is None:
+            cls._process_renderer = cls()
+        try:
+            return cls._process_renderer.render(*job)
+        except Exception as ex:
+            log.error(f"Failed rendering {job[0]} job ({ex})")
+            return None
+
+    @classmethod
+    def render_batch(cls, jobs: list[tuple], n_workers: Optional[int] = None) -> list:
+        """
+        Renders a batch of `(FIGURE_JOB kind, kwargs)` jobs to files, in worker processes that
+        each reuse a single renderer
+
+        Args:
+            jobs (list[tuple]): Jobs to render
+            n_workers (Optional[int], optional): Worker processes, `os.cpu_count()` if None;
+                1 renders in the calling process. Defaults to None.
+
+        Returns:
+            list: Result of every job (written path(s), None for failed ones)
+        """
+        n_workers = min(n_workers or os.cpu_count() or 1, max(len(jobs), 1))
+        if n_workers <= 1:
+            return [cls._render_in_process(job) for job in jobs]
+        with futures.ProcessPoolExecutor(max_workers=n_workers) as pool:
+            return list(pool.map(cls._render_in_process, jobs, chunksize=max(len(jobs) // (4 * n_workers), 1)))
+
+
+class ImageCache(object):
+    """
+    Decoded-image loading layer. Images are kept in an in-process LRU cache keyed by
+    (path, mtime, mode), evicted once their total size exceeds max_bytes, so editing a file
+    invalidates it. With a disk_cache_dir, decoded arrays are also saved there as `.npy` files
+    and memory-mapped on later loads (even by other processes or runs), skipping the
+    PGM/PNG/JPEG decoding entirely. Returned arrays are read-only, copy them to modify them.
+
+    Usage:
+        cache = ImageCache(max_bytes=1 << 30, disk_cache_dir="./.img-cache")
+        im = cache.get("./imgs-P1/iglesia.pgm")   # same as np.array(Image.open(f).convert('L'))
+    """
+    _default = None
+
+    def __init__(self, max_bytes: int = 512 << 20, disk_cache_dir: Optional[str] = None):
+        """
+        Args:
+            max_bytes (int, optional): In-memory budget. Defaults to 512 MiB.
+            disk_cache_dir (Optional[str], optional): Directory for the `.npy` cache, no disk
+                cache if None. Defaults to None.
+        """
+        self.max_bytes = max_bytes
+        self.disk_cache_dir = disk_cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if disk_cache_dir is not None:
+            os.makedirs(disk_cache_dir, exist_ok=True)
+
+    @classmethod
+    def default(cls) -> ImageCache:
+        """
+        Shared in-process cache (no disk cache), created on first use
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def __getstate__(self) -> dict:
+        # only the configuration travels to worker processes, each one fills its own cache
+        return {"max_bytes": self.max_bytes, "disk_cache_dir": self.disk_cache_dir}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _disk_path(self, key: tuple) -> str:
+        _digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_cache_dir, f"{_digest}.npy")
+
+    def _decode(self, path: str, mode: str, key: tuple) -> np.ndarray:
+        if self.disk_cache_dir is not None:
+            _npy = self._disk_path(key)
+            if os.path.exists(_npy):
+                try:
+                    return np.load(_npy, mmap_mode="r")
+                except Exception as ex:
+                    log.warning(f"Unable to reload cached '{_npy}' ({ex}), decoding again...")
+        
+        from PIL import Image
+        with Image.open(path) as _img:
+            _im = np.array(_img.convert(mode))
+        
+        if self.disk_cache_dir is not None:
+            _tmp = f"{_npy}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(_tmp, "wb") as file:
+                    np.save(file, _im)
+                os.replace(_tmp, _npy)  # atomic, concurrent writers never expose partial files
+            except Exception as ex:
+                log.warning(f"Unable to cache '{path}' on disk ({ex}), moving on...")
+                if os.path.exists(_tmp):
+                    os.remove(_tmp)
+        _im.setflags(write=False)
+        return _im
+
+    def get(self, path: str, mode: str = "L") -> np.ndarray:
+        """
+        Decoded image (as `np.array(Image.open(path).convert(mode))`, but read-only)
+
+        Args:
+            path (str): Image file
+            mode (str, optional): PIL mode. Defaults to "L".
+
+        Returns:
+            np.ndarray: Image
+        """
+        _key = self._key(path, mode)
+        with self._lock:
+            _im = self._entries.get(_key)
+            if _im is not None:
+                self._entries.move_to_end(_key)
+                self.hits += 1
+                return _im
+            self.misses += 1
+        
+        _im = self._decode(_key[0], mode, _key)
+        self._store(_key, _im)
+        return _im
+
+    def put(self, path: str, mode: str, image: np.ndarray):
+        """
+        Adds an image decoded elsewhere (e.g. by a worker process) to the in-memory cache
+
+        Args:
+            path (str): Image file it was decoded from
+            mode (str): PIL mode it was converted to
+            image (np.ndarray): Decoded image (made read-only)
+        """
+        _im = np.asarray(image)
+        _im.setflags(write=False)
+        self._store(self._key(path, mode), _im)
+
+    @staticmethod
+    def _key(path: str, mode: str) -> tuple:
+        _abspath = os.path.abspath(path)
+        return (_abspath, os.stat(_abspath).st_mtime_ns, mode)
+
+    def _store(self, key: tuple, image: np.ndarray):
+        if image.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = image
+                self._bytes += image.nbytes
+            while self._bytes > self.max_bytes:
+                _, _old = self._entries.popitem(last=False)
+                self._bytes -= _old.nbytes
+
+    def clear(self, disk: bool = False):
+        """
+        Empties the in-memory cache, and the `.npy` files of the disk cache if disk
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if disk and self.disk_cache_dir is not None:
+            with os.scandir(self.disk_cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".npy"):
+                        os.remove(entry.path)
+
+
+@dataclass
+class BatchTask:
+    """
+    One node of a `BatchRunner` task graph: a test applied to a file with a parameter set.
+    variant numbers the parameter sets of a test (from 1) when it has more than one, else 0
+    """
+    file: str
+    test: str
+    params: Any = None
+    index: int = 0
+    variant: int = 0
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of a `BatchTask`: the test outputs (None if it failed, see error), and the
+    (preprocessed) input image when the runner keeps inputs
+    """
+    task: BatchTask
+    outputs: Optional[list] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+    written: list = field(default_factory=list)
+    input: Any = None
+
+
+class BatchRunner(object):
+    """
+    Runs the (file x test x params) task graph of an image-processing lab on a pool of
+    worker processes. Tests are dispatched by name through a registry of functions (no eval),
+    every image is decoded once per batch and shared by all the tests run on it, and result
+    images are written by a background thread while the next results are still computed.
+
+    Usage:
+        runner = BatchRunner({"testHistEq": testHistEq}, output_dir="./out",
+                             suffixes={"testHistEq": "_heq"})
+        for result in runner.run(files, ["testHistEq"], {"testHistEq": [None]}):
+            ...
+    """
+    def __init__(self, registry: Optional[dict] = None, n_workers: Optional[int] = None,
+                 output_dir: Optional[str] = None, suffixes: Optional[dict] = None,
+                 pil_tests: tuple = (), preprocess=None, image_mode: str = "L",
+                 keep_inputs: bool = False, image_cache: Optional[ImageCache] = None,
+                 return_sources: bool = False):
+        """
+        Args:
+            registry (Optional[dict], optional): test name -> function. Functions are called
+                as func(im) if the parameter set is None, else func(im, params), and return a
+                list of outputs. Defaults to None (use `register`).
+            n_workers (Optional[int], optional): Worker processes, `os.cpu_count()` if None;
+                1 runs in the calling process. Defaults to None.
+            output_dir (Optional[str], optional): If given, the first output of every task is
+                saved there as '<name><suffix><ext>'. Defaults to None.
+            suffixes (Optional[dict], optional): test name -> file name suffix (defaults to
+                '_<test>'). Defaults to None.
+            pil_tests (tuple, optional): Tests that take the PIL image instead of the array.
+                Defaults to ().
+            preprocess (Callable, optional): Applied to (a copy of) the array before every
+                task, e.g. to add noise. Like the registry functions, it must be a module-level
+                function so worker processes can unpickle it. Defaults to None.
+            image_mode (str, optional): PIL mode images are converted to. Defaults to "L".
+            keep_inputs (bool, optional): Return every task's input in its result (useful
+                with a random preprocess, to display what the test saw). Defaults to False.
+            image_cache (Optional[ImageCache], optional): Decoded image cache (pass one with
+                a disk_cache_dir to skip decoding across runs). Defaults to the shared
+                in-process `ImageCache.default()`.
+            return_sources (bool, optional): Have worker processes send every decoded image
+                back, to be put in `image_cache` (only worth its pickling cost if the caller
+                then calls `load_image`, e.g. to display the inputs). Defaults to False.
+        """
+        self.registry = dict(registry or {})
+        self.n_workers = n_workers
+        self.output_dir = output_dir
+        self.suffixes = dict(suffixes or {})
+        self.pil_tests = tuple(pil_tests)
+        self.preprocess = preprocess
+        self.image_mode = image_mode
+        self.keep_inputs = keep_inputs
+        self.image_cache = image_cache if image_cache is not None else ImageCache.default()
+        self.return_sources = return_sources
+
+    def register(self, name: Optional[str] = None):
+        """
+        Decorator adding a test function to the registry (under its own name if None)
+        """
+        def _decorator(func):
+            self.registry[name or func.__name__] = func
+            return func
+        return _decorator
+
+    @staticmethod
+    def build_tasks(files: list[str], tests: list[str], params: Optional[dict] = None) -> list[BatchTask]:
+        """
+        Task graph of every file x test x parameter set
+
+        Args:
+            files (list[str]): Image files
+            tests (list[str]): Test names
+            params (Optional[dict], optional): test name -> list of parameter sets; tests
+                missing from it run once with None. Defaults to None.
+
+        Returns:
+            list[BatchTask]: Tasks, grouped by file
+        """
+        params = params or {}
+        _tasks = []
+        for _file in files:
+            for _test in tests:
+                _sets = params.get(_test, [None])
+                for _variant, _params in enumerate(_sets, start=1 if len(_sets) > 1 else 0):
+                    _tasks.append(BatchTask(_file, _test, _params, len(_tasks), _variant))
+        return _tasks
+
+    def load_image(self, path: str, mode: Optional[str] = None):
+        """
+        Decoded image, through the runner's `ImageCache`
+
+        Args:
+            path (str): Image file
+            mode (Optional[str], optional): PIL mode, the runner's if None. Defaults to None.
+
+        Returns:
+            tuple: (PIL image, read-only np.ndarray)
+        """
+        from PIL import Image
+        _im = self.image_cache.get(path, mode or self.image_mode)
+        return Image.fromarray(np.asarray(_im)), _im
+
+    def _run_file(self, file_tasks: list[BatchTask], return_source: bool = False):
+        """
+        Runs every task of one file, decoding it once
+
+        Returns:
+            list[BatchResult] | tuple: The results, or (decoded image, results) if
+                return_source, so a parent process can cache what its workers decoded
+        """
+        try:
+            if any(_task.test in self.pil_tests for _task in file_tasks):
+                _pil, _im = self.load_image(file_tasks[0].file)
+            else:
+                _pil, _im = None, self.image_cache.get(file_tasks[0].file, self.image_mode)
+        except Exception as ex:
+            log.error(f"Failed loading '{file_tasks[0].file}' ({ex})")
+            _results = [BatchResult(_task, error=str(ex)) for _task in file_tasks]
+            return (None, _results) if return_source else _results
+        
+        _results = []
+        for _task in file_tasks:
+            _start = time.perf_counter()
+            try:
+                _func = self.registry[_task.test]
+                if _task.test in self.pil_tests:
+                    _input = _pil
+                elif self.preprocess is not None:
+                    _input = self.preprocess(np.array(_im))
+                else:
+                    _input = np.array(_im)  # tests may modify their input
+                _outs = _func(_input) if _task.params is None else _func(_input, _task.params)
+                _results.append(BatchResult(_task, list(_outs), time.perf_counter() - _start,
+                                            input=_input if self.keep_inputs else None))
+            except Exception as ex:
+                log.error(f"Test '{_task.test}' failed on '{_task.file}' ({ex})")
+                _results.append(BatchResult(_task, None, time.perf_counter() - _start, str(ex)))
+        return (np.asarray(_im), _results) if return_source else _results
+
+    def _output_path(self, task: BatchTask) -> str:
+        _fname, _fext = os.path.splitext(os.path.basename(task.file))
+        _suffix = self.suffixes.get(task.test, f"_{task.test}")
+        if task.variant:
+            _suffix = f"{_suffix}_{task.variant}"
+        return os.path.join(self.output_dir, _fname + _suffix + _fext)
+
+    @staticmethod
+    def _write_output(path: str, image) -> str:
+        from PIL import Image
+        _im = np.asarray(image)
+        if _im.dtype != np.uint8:
+            _im = np.clip(_im, 0, 255).astype(np.uint8)
+        Image.fromarray(_im).save(path)
+        return path
+
+    def run(self, files: list[str], tests: list[str], params: Optional[dict] = None,
+            n_workers: Optional[int] = None, return_sources: Optional[bool] = None) -> list[BatchResult]:
+        """
+        Runs the task graph of files x tests x params
+
+        Args:
+            files (list[str]): Image files
+            tests (list[str]): Test names (must be in the registry)
+            params (Optional[dict], optional): See `build_tasks`. Defaults to None.
+            n_workers (Optional[int], optional): Overrides the runner's. Defaults to None.
+            return_sources (Optional[bool], optional): Overrides the runner's. Defaults to None.
+
+        Returns:
+            list[BatchResult]: One result per task, in task graph order
+        """
+        _missing = [_test for _test in tests if _test not in self.registry]
+        if _missing:
+            log.error(f"Tests not in the registry: {_missing}")
+            return None
+        _tasks = self.build_tasks(files, tests, params)
+        _by_file = {}
+        for _task in _tasks:
+            _by_file.setdefault(_task.file, []).append(_task)
+        _groups = list(_by_file.values())
+        _return_sources = self.return_sources if return_sources is None else return_sources
+        _n_workers = min(n_workers or self.n_workers or os.cpu_count() or 1, max(len(_groups), 1))
+        
+        if self.output_dir is not None:
+            os.makedirs(self.output_dir, exist_ok=True)
+        _results = [None] * len(_tasks)
+        _writes = []
+        with futures.ThreadPoolExecutor(max_workers=1) as writer:
+            def _collect(file_results: list[BatchResult]):
+                for _res in file_results:
+                    _results[_res.task.index] = _res
+                    if self.output_dir is not None and _res.outputs:
+                        _writes.append((_res, writer.submit(self._write_output, 
+                                                            self._output_path(_res.task), 
+                                                            _res.outputs[0])))
+            if _n_workers <= 1:
+                for _group in _groups:
+                    _collect(self._run_file(_group))
+            else:
+                # forked workers would otherwise share the parent's random state (same noise)
+                with futures.ProcessPoolExecutor(max_workers=_n_workers, 
+                                                 initializer=np.random.seed) as pool:
+                    _jobs = {pool.submit(self._run_file, _group, _return_sources): _group[0].file 
+                             for _group in _groups}
+                    for _future in futures.as_completed(_jobs):
+                        if _return_sources:
+                            _source, _file_results = _future.result()
+                        else:
+                            _source, _file_results = None, _future.result()
+                        # workers have their own caches: keep their decoded image in ours, so
+                        # `load_image` in this process doesn't decode it again
+                        if _source is not None:
+                            try:
+                                self.image_cache.put(_jobs[_future], self.image_mode, _source)
+                            except OSError:
+                                pass
+                        _collect(_file_results)
+            for _res, _write in _writes:
+                try:
+                    _res.written.append(_write.result())
+                except Exception as ex:
+                    log.warning(f"Unable to save output of '{_res.task.test}' on "
+                                f"'{_res.task.file}' ({ex}), moving on...")
+        return _results
+
+
+class DataDumping():
+    """
+    Dumping of signal matrices (one signal per inner list/row) to files, one column per signal.
+    The output format is chosen from the file extension:
+
+    | Extension | Writer |
+    |---|---|
+    | `.xlsx` | openpyxl write-only workbook, rows streamed (constant memory) |
+    | `.csv` | csv writer, rows streamed |
+    | `.parquet` | pyarrow, one column per signal (no transposition needed) |
+    | `.feather` | pyarrow, one column per signal (no transposition needed) |
+    | `.arrow` / `.ipc` | pyarrow IPC file, one column per signal, memory-mappable |
+
+    `load_matrix_from_file` reads any of them back; uncompressed Arrow/Feather files are
+    memory-mapped, so reloading them is nearly free.
+    """
+    ROW_BLOCK = 4096
+    ARROW_EXTENSIONS = ("parquet", "feather", "arrow", "ipc")
+
+    @staticmethod
+    def _iter_row_blocks(matrix, index: bool, block: int):
+        """
+        Yields blocks of output rows (sample i of every signal) without transposing the whole
+        matrix: arrays are sliced `block` samples at a time, lists are zipped lazily
+        """
+        if isinstance(matrix, np.ndarray):
+            for start in range(0, matrix.shape[1], block):
+                _rows = matrix[:, start:start + block].T.tolist()
+                if index:
+                    _rows = [[start + i] + row for i, row in enumerate(_rows)]
+                yield _rows
+            return
+
+        _rows_iter = zip(*matrix)
+        if index:
+            _rows_iter = ((i,) + row for i, row in enumerate(_rows_iter))
+        while True:
+            _rows = list(itertools.islice(_rows_iter, block))
+            if not _rows:
+                return
+            yield _rows
+
+    @staticmethod
+    def dump_matrix_to_file(matrix: list[list] | np.ndarray, output_path: str, index = False,
+                            compression: Optional[str] = None, row_group_size: Optional[int] = None) -> Optional[str]:
+        """
+        Dumps a set of signals to a file with one column per signal (named 0..n-1), streaming
+        the rows so the transposed matrix is never built in memory
+
+        Args:
+            matrix (list[list] | np.ndarray): Signals, one per inner list / array row
+            output_path (str): Output file, its extension picks the format (xlsx, csv,
+                parquet, feather, arrow/ipc)
+            index (bool, optional): Add the sample index as first column. Defaults to False.
+            compression (Optional[str], optional): Only for columnar formats, codec name
+                ('snappy', 'zstd', 'lz4', 'gzip'...). Defaults to None: snappy for parquet,
+                uncompressed (memory-mappable) for feather and arrow.
+            row_group_size (Optional[int], optional): Only for columnar formats, rows per
+                parquet row group / Arrow record batch. Defaults to None (pyarrow default).
+
+        Returns:
+            Optional[str]: output_path, None if it fails
+        """
+        _ext = output_path.split(".")[-1].lower()
+        if isinstance(matrix, np.ndarray) and matrix.ndim == 1:
+            matrix = matrix[np.newaxis, :]
+        _header = ([""] if index else []) + list(range(len(matrix)))
+
+        try:
+            if _ext in DataDumping.ARROW_EXTENSIONS:
+                import pyarrow as pa
+                _columns = {str(i): np.asarray(signal) for i, signal in enumerate(matrix)}
+                if index:
+                    _columns = {"index": np.arange(len(matrix[0])), **_columns}
+                _table = pa.table(_columns)
+                if _ext == "parquet":
+                    import pyarrow.parquet as pq
+                    pq.write_table(_table, output_path, compression=compression or "snappy",
+                                   row_group_size=row_group_size)
+                elif _ext == "feather":
+                    import pyarrow.feather as pf
+                    pf.write_feather(_table, output_path, compression=compression or "uncompressed",
+                                     chunksize=row_group_size)
+                else:
+                    _options = pa.ipc.IpcWriteOptions(compression=compression)
+                    with pa.OSFile(output_path, "wb") as sink:
+                        with pa.ipc.new_file(sink, _table.schema, options=_options) as writer:
+                            writer.write_table(_table, max_chunksize=row_group_size)
+
+            elif _ext == "csv":
+                with open(output_path, "w", newline="") as file:
+                    _writer = csv.writer(file)
+                    _writer.writerow(_header)
+                    for _rows in DataDumping._iter_row_blocks(matrix, index, DataDumping.ROW_BLOCK):
+                        _writer.writerows(_rows)
+
+            elif _ext in ("xlsx", "xlsm"):
+                from openpyxl import Workbook
+                _workbook = Workbook(write_only=True)
+                _sheet = _workbook.create_sheet("Sheet1")
+                _sheet.append(_header)
+                for _rows in DataDumping._iter_row_blocks(matrix, index, DataDumping.ROW_BLOCK):
+                    for _row in _rows:
+                        _sheet.append(_row)
+                _workbook.save(output_path)
+
+            else:
+                log.error(f"Unsupported output format '.{_ext}' (xlsx, csv, parquet, feather)")
+                return None
+
+        except ImportError as ex:
+            log.error(f"Missing optional dependency for '.{_ext}' output ({ex})")
+            return None
+
+        log.debug(f"Dumped {len(matrix)} signals to '{output_path}'")
+        return output_path
+
+    @staticmethod
+    def load_matrix_from_file(input_path: str, memory_map: bool = True, as_table: bool = False):
+        """
+        Loads a file written by `dump_matrix_to_file` back as a signal matrix (one signal per
+        row). Arrow/Feather files are memory-mapped when `memory_map` is set, so with
+        `as_table` no data is copied at all. The NumPy matrix is row-major (one signal per
+        row) while the files are columnar, so building it always copies every column once,
+        into a dtype able to hold all of them (e.g. int and float columns give a float matrix).
+
+        Args:
+            input_path (str): File to load, format taken from its extension
+            memory_map (bool, optional): Memory-map columnar files. Defaults to True.
+            as_table (bool, optional): Return the `pyarrow.Table` (columnar formats only)
+                instead of a NumPy matrix. Defaults to False.
+
+        Returns:
+            np.ndarray | pyarrow.Table: (n_signals, n_samples) matrix, None if it fails
+        """
+        _ext = input_path.split(".")[-1].lower()
+        try:
+            if _ext in DataDumping.ARROW_EXTENSIONS:
+                import pyarrow as pa
+                if _ext == "parquet":
+                    import pyarrow.parquet as pq
+                    _table = pq.read_table(input_path, memory_map=memory_map)
+                else:
+                    _source = pa.memory_map(input_path, "r") if memory_map else pa.OSFile(input_path, "rb")
+                    _table = pa.ipc.open_file(_source).read_all()
+                if "index" in _table.column_names:
+                    _table = _table.drop_columns(["index"])
+                if as_table:
+                    return _table
+                if _table.num_columns == 0:
+                    return np.empty((0, 0))
+                _dtypes = [np.dtype(_field.type.to_pandas_dtype()) for _field in _table.schema]
+                if any(_column.null_count for _column in _table.columns):
+                    _dtypes.append(np.dtype(np.float64))  # nulls come back as NaN
+                out = np.empty((_table.num_columns, _table.num_rows), dtype=np.result_type(*_dtypes))
+                for i, _column in enumerate(_table.columns):
+                    _offset = 0
+                    for _chunk in _column.chunks:
+                        out[i, _offset:_offset + len(_chunk)] = _chunk.to_numpy(zero_copy_only=False)
+                        _offset += len(_chunk)
+                return out
+
+            if _ext == "csv":
+                df = pd.read_csv(input_path, float_precision="round_trip")
+            elif _ext in ("xlsx", "xlsm"):
+                df = pd.read_excel(input_path)
+            else:
+                log.error(f"Unsupported input format '.{_ext}' (xlsx, csv, parquet, feather, arrow)")
+                return None
+        except ImportError as ex:
+            log.error(f"Missing optional dependency for '.{_ext}' input ({ex})")
+            return None
+
+        if len(df.columns) and str(df.columns[0]).startswith("Unnamed"):
+            df = df.drop(columns=df.columns[0])  # index column written with an empty header
+        return df.to_numpy().T
+
+    @staticmethod
+    def benchmark_formats(matrix: np.ndarray, output_dir: str,
+                          extensions: tuple = ("xlsx", "csv", "parquet", "feather", "arrow")) -> dict:
+        """
+        Dumps and reloads the same matrix in every format, measuring time and file size.
+        Every reload is checked against the original (values and shape), logging an error on
+        mismatches, so the benchmark also works as a round-trip check. csv and the arrow
+        formats must match exactly; xlsx stores doubles as 15 significant digits, so it is
+        compared with np.allclose at a relative tolerance of 1e-12 (and no absolute one).
+
+        Args:
+            matrix (np.ndarray): Signals, one per row
+            output_dir (str): Directory for the scratch files (removed afterwards)
+            extensions (tuple, optional): Formats to compare. Defaults to all of them.
+
+        Returns:
+            dict: {extension: (dump seconds, load seconds, size in bytes)}
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        results = {}
+        for _ext in extensions:
+            _path = f"{output_dir}/bench_{TimeStamp.formatted()}.{_ext}"
+            _start = time.perf_counter()
+            if DataDumping.dump_matrix_to_file(matrix, _path) is None:
+                continue
+            _dump = time.perf_counter() - _start
+            _start = time.perf_counter()
+            _loaded = DataDumping.load_matrix_from_file(_path)
+            _load = time.perf_counter() - _start
+            _expected = np.asarray(matrix, dtype=float)
+            _actual = None if _loaded is None else np.asarray(_loaded, dtype=float)
+            if _actual is None or _actual.shape != _expected.shape:
+                _matches = False
+            elif _ext == "xlsx":
+                _matches = np.allclose(_actual, _expected, rtol=1e-12, atol=0.0)
+            else:
+                _matches = np.array_equal(_actual, _expected)
+            if not _matches:
+                log.error(f"'.{_ext}' round trip doesn't reproduce the dumped matrix")
+            results[_ext] = (_dump, _load, os.path.getsize(_path))
+            os.remove(_path)
+            log.info(f"{_ext:<8} dump {_dump:8.3f} s   load {_load:8.3f} s   {results[_ext][2]:>12} B")
+        return results
+
+
+class DescriptiveStrPrint(object):
+    pass
+
+
+class SqlMethods(object):
+    """
+    SQLite data-access layer. Every thread gets its own connection (created on first use and
+    kept in a thread-local pool), opened in WAL mode so readers don't block the writer.
+    Queries are parameterized so sqlite3 reuses its prepared statements, bulk inserts go
+    through `executemany` inside a single transaction, and reads are streamed with
+    `fetchmany` as DataFrame batches.
+    """
+    STATEMENT_CACHE_SIZE = 256
+
+    def __init__(self, path: str, table: Optional[str] = None, timeout: float = 30.0):
+        """
+        Args:
+            path (str): Database file (created if it doesn't exist)
+            table (Optional[str], optional): Default table for the table helpers. Defaults to None.
+            timeout (float, optional): Seconds to wait on a locked database. Defaults to 30.
+        """
+        self._path = FileManagement.path_to_python(path)
+        self.table = table
+        self._timeout = timeout
+        self._local = threading.local()
+        self._connections: list = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def _open_connection(self) -> sql.Connection:
+        _conn = sql.connect(self._path, timeout=self._timeout, check_same_thread=False,
+                            cached_statements=self.STATEMENT_CACHE_SIZE)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        return _conn
+
+    @property
+    def connection(self) -> sql.Connection:
+        """
+        sql.Connection: Connection of the calling thread
+        """
+        _conn = getattr(self._local, "connection", None)
+        if _conn is None:
+            _conn = self._open_connection()
+            self._local.connection = _conn
+            with self._lock:
+                self._connections.append(_conn)
+        return _conn
+
+    @property
+    def cursor(self) -> sql.Cursor:
+        """
+        sql.Cursor: New cursor on the connection of the calling thread
+        """
+        return self.connection.cursor()
+
+    def close(self):
+        """
+        Closes the connections of every thread
+        """
+        with self._lock:
+            for _conn in self._connections:
+                try:
+                    _conn.close()
+                except Exception as ex:
+                    log.warning(f"Failed closing sqlite connection ({ex})")
+            self._connections = []
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def execute(self, query: str, params: tuple | dict = ()) -> sql.Cursor:
+        """
+        Executes a parameterized statement in its own transaction
+
+        Args:
+            query (str): SQL statement
+            params (tuple | dict, optional): Statement parameters. Defaults to ().
+
+        Returns:
+            sql.Cursor: Cursor with the results
+        """
+        with self.connection as _conn:
+            return _conn.execute(query, params)
+
+    def create_table(self, columns: dict, table: Optional[str] = None):
+        """
+        Creates a table if it doesn't exist
+
+        Args:
+            columns (dict): {column name: SQLite type}
+            table (Optional[str], optional): Table name, `self.table` if None. Defaults to None.
+        """
+        _cols = ", ".join(f"{self._quote(name)} {kind}" for name, kind in columns.items())
+        self.execute(f"CREATE TABLE IF NOT EXISTS {self._quote(table or self.table)} ({_cols})")
+
+    def insert_many(self, rows, columns: list[str], table: Optional[str] = None) -> int:
+        """
+        Bulk inserts rows with a single prepared statement and a single transaction
+
+        Args:
+            rows (Iterable[Sequence] | np.ndarray | pd.DataFrame): Rows, in `columns` order
+            columns (list[str]): Target columns
+            table (Optional[str], optional): Table name, `self.table` if None. Defaults to None.
+
+        Returns:
+            int: Inserted rows
+        """
+        if isinstance(rows, pd.DataFrame):
+            rows = rows[columns].itertuples(index=False, name=None)
+        elif isinstance(rows, np.ndarray):
+            rows = map(tuple, rows.tolist())
+        _query = (f"INSERT INTO {self._quote(table or self.table)} "
+                  f"({', '.join(self._quote(c) for c in columns)}) "
+                  f"VALUES ({', '.join('?' * len(columns))})")
+        with self.connection as _conn:
+            return _conn.executemany(_query, rows).rowcount
+
+    def iter_batches(self, query: str, params: tuple | dict = (), batch_size: int = 65536,
+                     as_frame: bool = True):
+        """
+        Streams the result of a query in batches instead of materializing every row
+
+        Args:
+            query (str): SQL query
+            params (tuple | dict, optional): Query parameters. Defaults to ().
+            batch_size (int, optional): Rows per batch. Defaults to 65536.
+            as_frame (bool, optional): Yield DataFrames, else 2D NumPy arrays. Defaults to True.
+
+        Yields:
+            pd.DataFrame | np.ndarray: Batch of rows
+        """
+        _cursor = self.connection.execute(query, params)
+        _columns = [desc[0] for desc in _cursor.description]
+        try:
+            while True:
+                _rows = _cursor.fetchmany(batch_size)
+                if not _rows:
+                    break
+                yield pd.DataFrame.from_records(_rows, columns=_columns) if as_frame else np.array(_rows)
+        finally:
+            _cursor.close()
+
+    def getColumnsFromTable(self, columns: list[str], table: Optional[str] = None,
+                            batch_size: int = 65536) -> pd.DataFrame:
+        """
+        Reads some columns of a table
+
+        Args:
+            columns (list[str]): Columns to read
+            table (Optional[str], optional): Table name, `self.table` if None. Defaults to None.
+            batch_size (int, optional): Rows fetched per batch. Defaults to 65536.
+
+        Returns:
+            pd.DataFrame: Table columns
+        """
+        _query = f"SELECT {', '.join(self._quote(c) for c in columns)} FROM {self._quote(table or self.table)}"
+        _batches = list(self.iter_batches(_query, batch_size=batch_size))
+        return pd.concat(_batches, ignore_index=True) if _batches else pd.DataFrame(columns=columns)
+
+    def getAllFromTable(self, table: Optional[str] = None, batch_size: int = 65536) -> pd.DataFrame:
+        """
+        Reads a whole table
+
+        Args:
+            table (Optional[str], optional): Table name, `self.table` if None. Defaults to None.
+            batch_size (int, optional): Rows fetched per batch. Defaults to 65536.
+
+        Returns:
+            pd.DataFrame: Table contents
+        """
+        _batches = list(self.iter_batches(f"SELECT * FROM {self._quote(table or self.table)}",
+                                          batch_size=batch_size))
+        return pd.concat(_batches, ignore_index=True) if _batches else pd.DataFrame()
+
+    def read_column(self, column: str, table: Optional[str] = None, where: Optional[str] = None,
+                    params: tuple | dict = (), dtype: Any = np.float64, batch_size: int = 65536,
+                    out_path: Optional[str] = None, null_value: Any = np.nan,
+                    prealloc: bool = True) -> np.ndarray:
+        """
+        Streams a single numeric column straight into a NumPy array. Rows are pulled from the
+        cursor `batch_size` at a time with `np.fromiter` (a scalar row factory avoids building
+        tuples and lists), and written into a buffer preallocated from a `COUNT(*)` taken in
+        the same read transaction, so peak memory is about the size of the final array. With
+        `prealloc=False` the count is skipped and the buffer grows geometrically in place.
+
+        Args:
+            column (str): Column to read
+            table (Optional[str], optional): Table name, `self.table` if None. Defaults to None.
+            where (Optional[str], optional): SQL condition, with `params` placeholders.
+                Defaults to None.
+            params (tuple | dict, optional): Parameters of `where`. Defaults to ().
+            dtype (Any, optional): Output dtype. Defaults to np.float64.
+            batch_size (int, optional): Rows fetched per batch. Defaults to 65536.
+            out_path (Optional[str], optional): Write into a memory-mapped `.npy` file instead
+                of RAM (forces `prealloc`). Defaults to None.
+            null_value (Any, optional): Value stored for NULLs. Defaults to np.nan.
+            prealloc (bool, optional): Size the buffer with a COUNT(*) first. Defaults to True.
+
+        Returns:
+            np.ndarray: Column values (`np.memmap` if `out_path` was given)
+        """
+        _from = f"FROM {self._quote(table or self.table)}" + (f" WHERE {where}" if where else "")
+        _conn = self.connection
+        _own_transaction = not _conn.in_transaction
+        prealloc = prealloc or out_path is not None
+
+        if _own_transaction:
+            _conn.execute("BEGIN")  # COUNT and SELECT see the same snapshot
+        try:
+            _size = _conn.execute(f"SELECT COUNT(*) {_from}", params).fetchone()[0] if prealloc else batch_size
+            if out_path is not None:
+                out = np.lib.format.open_memmap(FileManagement.path_to_python(out_path), mode="w+",
+                                                dtype=dtype, shape=(_size,))
+            else:
+                out = np.empty(_size, dtype=dtype)
+
+            _cursor = _conn.cursor()
+            _cursor.row_factory = lambda cursor, row: null_value if row[0] is None else row[0]
+            _cursor.execute(f"SELECT {self._quote(column)} {_from}", params)
+
+            _n = 0
+            while True:
+                _batch = np.fromiter(itertools.islice(_cursor, batch_size), dtype=dtype)
+                if _batch.size == 0:
+                    break
+                if _n + _batch.size > out.size:
+                    out.resize(max(2 * out.size, _n + _batch.size), refcheck=False)
+                out[_n:_n + _batch.size] = _batch
+                _n += _batch.size
+            _cursor.close()
+        finally:
+            if _own_transaction:
+                _conn.commit()
+
+        if out_path is not None:
+            out.flush()
+        elif _n != out.size:
+            out.resize(_n, refcheck=False)
+        return out
+
+    @staticmethod
+    def benchmark(path: str, n_rows: int = 100000) -> dict:
+        """
+        Compares naive row-by-row access (one INSERT + commit per row, one fetchone per row)
+        against `insert_many` and `iter_batches` on a scratch table
+
+        Args:
+            path (str): Scratch database file (its `bench` table is dropped)
+            n_rows (int, optional): Rows to insert and scan. Defaults to 100000.
+
+        Returns:
+            dict: Rows per second for each operation
+        """
+        _rows = [(i, float(i) * 0.5, f"row{i}") for i in range(n_rows)]
+        _columns = {"id": "INTEGER", "value": "REAL", "name": "TEXT"}
+        results = {}
+
+        with SqlMethods(path, table="bench") as db:
+            db.execute("DROP TABLE IF EXISTS bench")
+            db.create_table(_columns)
+
+            _start = time.perf_counter()
+            for _row in _rows:
+                _conn = db.connection
+                _conn.execute("INSERT INTO bench (id, value, name) VALUES (?, ?, ?)", _row)
+                _conn.commit()
+            results["naive_insert"] = n_rows / (time.perf_counter() - _start)
+
+            _start = time.perf_counter()
+            _cursor = db.connection.execute("SELECT * FROM bench")
+            while _cursor.fetchone() is not None:
+                pass
+            results["naive_scan"] = n_rows / (time.perf_counter() - _start)
+
+            db.execute("DELETE FROM bench")
+            _start = time.perf_counter()
+            db.insert_many(_rows, list(_columns))
+            results["bulk_insert"] = n_rows / (time.perf_counter() - _start)
+
+            _start = time.perf_counter()
+            for _ in db.iter_batches("SELECT * FROM bench"):
+                pass
+            results["batched_scan"] = n_rows / (time.perf_counter() - _start)
+
+            db.execute("DROP TABLE bench")
+
+        for key, val in results.items():
+            log.info(f"{key:<14} {val:>14,.0f} rows/s")
+        return results
+
+
+class _SqlQueryState(object):
+    """
+    Per-query token shared by `AsyncSqlExecutor.query` and the worker running it: the
+    connection is only interrupted while this very query is executing on it
+    """
+    __slots__ = ("lock", "connection", "running", "cancelled")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connection = None
+        self.running = False
+        self.cancelled = False
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            if self.running:
+                self.connection.interrupt()
+
+
+class AsyncSqlExecutor(object):
+    """
+    asyncio front-end for read queries on a SQLite database. Queries run on a dedicated thread
+    pool, each worker thread holding its own read-only connection (`mode=ro` URI plus
+    `PRAGMA query_only`), so the event loop never blocks on sqlite3. A semaphore bounds the
+    queries in flight (backpressure: callers wait for a slot), every query can carry a timeout,
+    and cancelled or timed out queries are interrupted on their connection. Latencies are
+    recorded in a log-spaced histogram to report percentiles under load.
+    """
+    HISTOGRAM_EDGES = np.logspace(-5, 2, 141)  # 10 us .. 100 s
+    CANCEL_CHECK_STEPS = 1000  # SQLite VM instructions between checks of the cancelled flag
+
+    def __init__(self, path: str, n_workers: int = 4, max_pending: int = 64,
+                 default_timeout: Optional[float] = None):
+        """
+        Args:
+            path (str): Database file
+            n_workers (int, optional): Query threads (and connections). Defaults to 4.
+            max_pending (int, optional): Queries running or queued before `query` waits.
+                Defaults to 64.
+            default_timeout (Optional[float], optional): Seconds per query if not given on the
+                call, None for no limit. Defaults to None.
+        """
+        self._uri = f"file:{FileManagement.path_to_python(path)}?mode=ro"
+        self._local = threading.local()
+        self._connections: list = []
+        self._lock = threading.Lock()
+        self._pool = futures.ThreadPoolExecutor(max_workers=n_workers,
+                                                           thread_name_prefix="AsyncSql")
+        self._slots = asyncio.Semaphore(max_pending)
+        self._default_timeout = default_timeout
+        self._histogram = np.zeros(self.HISTOGRAM_EDGES.size + 1, dtype=np.int64)
+        self.count = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+    def _connection(self) -> sql.Connection:
+        _conn = getattr(self._local, "connection", None)
+        if _conn is None:
+            _conn = sql.connect(self._uri, uri=True, check_same_thread=False,
+                                cached_statements=SqlMethods.STATEMENT_CACHE_SIZE)
+            _conn.execute("PRAGMA query_only=ON")
+            self._local.connection = _conn
+            with self._lock:
+                self._connections.append(_conn)
+        return _conn
+
+    def _run(self, query: str, params: tuple | dict, as_frame: bool, state: _SqlQueryState):
+        _conn = self._connection()
+        with state.lock:
+            if state.cancelled:  # timed out or cancelled while still queued
+                raise sql.OperationalError("interrupted")
+            state.connection = _conn
+            state.running = True
+        # an interrupt() landing before the statement starts is a no-op: the progress handler
+        # also aborts it as soon as it sees the flag, whenever cancel() happened
+        _conn.set_progress_handler(lambda: state.cancelled, self.CANCEL_CHECK_STEPS)
+        try:
+            _cursor = _conn.execute(query, params)
+            _rows = _cursor.fetchall()
+        finally:
+            _conn.set_progress_handler(None, 0)
+            with state.lock:  # from here on, cancel() can't touch this connection anymore
+                state.running = False
+        if as_frame:
+            return pd.DataFrame.from_records(_rows, columns=[desc[0] for desc in _cursor.description])
+        return _rows
+
+    def _record(self, seconds: float):
+        with self._lock:
+            self._histogram[np.searchsorted(self.HISTOGRAM_EDGES, seconds)] += 1
+            self.count += 1
+
+    async def query(self, query: str, params: tuple | dict = (), timeout: Optional[float] = None,
+                    as_frame: bool = True):
+        """
+        Runs a read query without blocking the event loop
+
+        Args:
+            query (str): SQL query
+            params (tuple | dict, optional): Query parameters. Defaults to ().
+            timeout (Optional[float], optional): Seconds before the query is interrupted and
+                `asyncio.TimeoutError` raised. Defaults to the executor's `default_timeout`.
+            as_frame (bool, optional): Return a DataFrame, else a list of tuples. Defaults to True.
+
+        Returns:
+            pd.DataFrame | list: Query result
+        """
+        timeout = self._default_timeout if timeout is None else timeout
+        async with self._slots:
+            _loop = asyncio.get_running_loop()
+            _state = _SqlQueryState()
+            _start = time.perf_counter()
+            _future = _loop.run_in_executor(self._pool, self._run, query, params, as_frame, _state)
+            try:
+                return await asyncio.wait_for(_future, timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                _state.cancel()
+                raise
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                _state.cancel()
+                raise
+            finally:
+                self._record(time.perf_counter() - _start)
+
+    def percentile(self, p: float) -> float:
+        """
+        Latency percentile from the histogram (upper edge of the bucket holding it)
+
+        Args:
+            p (float): Percentile in [0, 100]
+
+        Returns:
+            float: Seconds, NaN if nothing was recorded
+        """
+        if self.count == 0:
+            return float("nan")
+        _bucket = int(np.searchsorted(np.cumsum(self._histogram), p / 100.0 * self.count))
+        _edges = np.append(self.HISTOGRAM_EDGES, np.inf)
+        return float(_edges[min(_bucket, _edges.size - 1)])
+
+    def latency_stats(self) -> dict:
+        """
+        Returns:
+            dict: Query count, timeouts, cancellations and p50/p90/p99 latencies (seconds)
+        """
+        return {"count": self.count, "timeouts": self.timeouts, "cancelled": self.cancelled,
+                "p50": self.percentile(50), "p90": self.percentile(90), "p99": self.percentile(99)}
+
+    def close(self):
+        """
+        Waits for running queries and closes the pool and its connections
+        """
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            for _conn in self._connections:
+                _conn.close()
+            self._connections = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+def betterPrint(msg:str, color: str):
+    """_summary_
+
+    Args:
+        msg (str): Message to print
+        color (str): Color information
+    """
+    print(f"{color}{msg}{BCOLORS.ENDC}")
+    return
+
+
+IMPORT_TIME_BUDGET_MS = 250.0
+
+
+def benchmark_import_time(budget_ms: float = IMPORT_TIME_BUDGET_MS, runs: int = 5) -> float:
+    """
+    Measures the cumulative import time of this module with `python -X importtime` in fresh
+    interpreters (best of `runs`), and logs an error if it goes over the regression budget
+
+    Args:
+        budget_ms (float, optional): Allowed import time in milliseconds. Defaults to
+            IMPORT_TIME_BUDGET_MS.
+        runs (int, optional): Interpreters to launch. Defaults to 5.
+
+    Returns:
+        float: Best import time in milliseconds
+    """
+    _module = os.path.splitext(os.path.basename(__file__))[0]
+    _best = float("inf")
+    for _ in range(runs):
+        _proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {_module}"],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True)
+        for _line in _proc.stderr.splitlines():
+            _fields = _line.split("|")
+            if len(_fields) == 3 and _fields[2].strip() == _module:
+                _best = min(_best, int(_fields[1]) / 1000.0)
+
+    if _best > budget_ms:
+        log.error(f"Importing {_module} took {_best:.1f} ms (budget {budget_ms:.1f} ms)")
+    else:
+        log.info(f"Importing {_module} took {_best:.1f} ms (budget {budget_ms:.1f} ms)")
+    return _best
@@ -5,34 +5,146 @@ from PIL import Image
 import numpy as np
 import glob
 import os
+from concurrent.futures import ThreadPoolExecutor
+import sys
 import visualPercepUtils as vpu
 
-def histeq(im, nbins=256):
-    imhist, bins = np.histogram(im.flatten(), list(range(nbins)), density=False)
-    cdf = imhist.cumsum() # cumulative distribution function (CDF) = cummulative histogram
-    factor = 255 / cdf[-1]  # cdf[-1] = last element of the cummulative sum = total number of pixels)
-    im2 = np.interp(im.flatten(), bins[:-1], factor*cdf)
-    return im2.reshape(im.shape), cdf
+sys.path.append("../../..") # set the path for Common.py
+from Common import BatchRunner, ImageCache, LookupTable, PIXEL_DEPTH
+
+def histeq(im, nbins=None, in_place=False):
+    # 8 and 16 bit images: exact integer path, one bin per gray level. The histogram is a
+    # bincount and the equalization a lookup table (the scaled CDF) indexed by the image
+    if im.dtype in (PIXEL_DEPTH.BIT8, PIXEL_DEPTH.BIT16) and nbins in (None, np.iinfo(im.dtype).max + 1):
+        maxval = np.iinfo(im.dtype).max
+        imhist = LookupTable.histogram(im)
+        cdf = imhist.cumsum() # cumulative distribution function (CDF) = cummulative histogram
+        lut = (cdf.astype(np.int64) * int(maxval) // int(cdf[-1])).astype(im.dtype) # cdf[-1] = total number of pixels
+        im2 = LookupTable.apply(im, lut, out=im if in_place else None)
+        return im2, cdf
+
+    # any other image: nbins equal-width bins over [0, 255]
+    nbins = 256 if nbins is None else nbins
+    imhist, bins = np.histogram(im.ravel(), np.linspace(0, 255, nbins + 1), density=False)
+    cdf = imhist.cumsum()
+    factor = 255 / cdf[-1]
+    im2 = np.interp(im.ravel(), bins[:-1], factor*cdf).reshape(im.shape)
+    if in_place:
+        im[...] = im2
+        return im, cdf
+    return im2, cdf
+
+# -----------------------
+# Adaptive histogram equalization (CLAHE)
+# -----------------------
+# The image is split in a grid of tiles, each one gets its own (clipped) histogram equalization
+# LUT, and every pixel is mapped by bilinear interpolation of the LUTs of the 4 nearest tile
+# centers. Work is split in horizontal strips of rows (bounded temporaries, so huge or
+# memory-mapped scans can be processed), which run in a thread pool (NumPy releases the GIL)
+
+def _tileHistograms(im, r0, r1, colTile, ntx, nlevels, stripRows):
+    # histograms of the tiles of one row of tiles, one vectorized bincount per strip
+    hist = np.zeros(ntx * nlevels, dtype=np.int64)
+    colOffset = colTile * nlevels
+    for s in range(r0, r1, stripRows):
+        idx = colOffset + im[s:min(s + stripRows, r1)]
+        hist += np.bincount(idx.ravel(), minlength=ntx * nlevels)
+    return hist.reshape(ntx, nlevels)
+
+def _claheLuts(hist, tilePixels, clipLimit, maxval):
+    # hist: (nty, ntx, nlevels) -> clipped, equalizing LUTs with the same shape
+    hist = hist.astype(np.float64)
+    if clipLimit is not None and clipLimit > 0:
+        limit = np.maximum(clipLimit * tilePixels / hist.shape[-1], 1.0)[..., None]
+        excess = np.maximum(hist - limit, 0).sum(axis=-1, keepdims=True)
+        hist = np.minimum(hist, limit) + excess / hist.shape[-1] # clipped counts spread evenly
+    cdf = hist.cumsum(axis=-1)
+    return np.floor(cdf * (maxval / cdf[..., -1:])).astype(np.float32)
+
+def _interpWeights(n, edges):
+    # position of every row (or column) in tile-center coordinates: nearest lower tile and weight
+    centers = (edges[:-1] + edges[1:] - 1) / 2.
+    pos = np.interp(np.arange(n), centers, np.arange(len(centers)))
+    t0 = np.minimum(pos.astype(np.intp), max(len(centers) - 2, 0))
+    t1 = np.minimum(t0 + 1, len(centers) - 1)
+    return t0, t1, (pos - t0).astype(np.float32)
+
+def _claheStrip(im, out, s, e, luts, rows, cols, maxval):
+    i0, i1, wy = (a[s:e, None] for a in rows)
+    j0, j1, wx = cols
+    ntx, nlevels = luts.shape[1:]
+    lut = luts.reshape(-1)
+    v = im[s:e].astype(np.intp)
+    r0, r1 = i0 * (ntx * nlevels) + v, i1 * (ntx * nlevels) + v
+    c0, c1 = j0 * nlevels, j1 * nlevels
+    top = lut[r0 + c0] * (1 - wx) + lut[r0 + c1] * wx
+    bottom = lut[r1 + c0] * (1 - wx) + lut[r1 + c1] * wx
+    res = top * (1 - wy) + bottom * wy
+    out[s:e] = np.clip(np.rint(res), 0, maxval)
+
+def clahe(im, tiles=(8, 8), clipLimit=2.0, nWorkers=4, stripRows=None, out=None):
+    # im: uint8/uint16 image (PIXEL_DEPTH.BIT8/BIT16), may be a np.memmap
+    # tiles: (rows, cols) of the tile grid; clipLimit: max. histogram bin height relative to a
+    # flat histogram (None or 0 = no clipping, plain adaptive equalization)
+    # stripRows: rows processed at once (defaults to ~4M pixels); out: output array (may be im)
+    if im.dtype not in (PIXEL_DEPTH.BIT8, PIXEL_DEPTH.BIT16):
+        im = np.clip(im, 0, 255).astype(PIXEL_DEPTH.BIT8)
+    maxval = np.iinfo(im.dtype).max
+    nlevels = maxval + 1
+    h, w = im.shape
+    nty, ntx = min(tiles[0], h), min(tiles[1], w)
+    yedges = np.linspace(0, h, nty + 1).astype(np.intp)
+    xedges = np.linspace(0, w, ntx + 1).astype(np.intp)
+    colTile = np.repeat(np.arange(ntx), np.diff(xedges))
+    if stripRows is None:
+        stripRows = max(1, (1 << 22) // w)
+    if out is None:
+        out = np.empty_like(im)
+
+    with ThreadPoolExecutor(max_workers=nWorkers) as pool:
+        hist = np.stack(list(pool.map(
+            lambda i: _tileHistograms(im, yedges[i], yedges[i + 1], colTile, ntx, nlevels, stripRows),
+            range(nty))))
+        tilePixels = np.diff(yedges)[:, None] * np.diff(xedges)[None, :]
+        luts = _claheLuts(hist, tilePixels, clipLimit, maxval)
+        rows, cols = _interpWeights(h, yedges), _interpWeights(w, xedges)
+        cols = tuple(a[None, :] for a in cols)
+        list(pool.map(lambda s: _claheStrip(im, out, s, min(s + stripRows, h), luts, rows, cols, maxval),
+                      range(0, h, stripRows)))
+    return out, luts
+
+def testClahe(im):
+    im2, luts = clahe(im)
+    return [im2]
 
 def testHistEq(im):
     im2, cdf = histeq(im)
     return [im2, cdf]
 
-def darkenImg(im,p=2):
+def _darken(im, p):
     return (im ** float(p)) / (255 ** (p - 1)) # try without the float conversion and see what happens
 
-def brightenImg(im,p=2):
+def _brighten(im, p):
     return np.power(255.0 ** (p - 1) * im, 1. / p)  # notice this NumPy function is different to the scalar math.pow(a,b)
 
+# uint8/uint16 images only have 256/65536 possible values: the transform is computed once per
+# value and parameter (cached lookup table) and then applied to the image by indexing.
+# out_dtype=np.uint8 gives the same values as casting the float result with astype(np.uint8)
+def darkenImg(im,p=2,out_dtype=None):
+    return LookupTable.transform(im, _darken, p, out_dtype=out_dtype)
+
+def brightenImg(im,p=2,out_dtype=None):
+    return LookupTable.transform(im, _brighten, p, out_dtype=out_dtype)
+
 
 def testDarkenImg(im):
-    im2 = darkenImg(im,p=2) #  Is "p=2" different here than in the function definition? Can we remove "p=" here?
+    im2 = darkenImg(im,p=2,out_dtype=np.uint8) #  Is "p=2" different here than in the function definition? Can we remove "p=" here?
     return [im2]
 
 
 def testBrightenImg(im):
     p=2
-    im2=brightenImg(im,p)
+    im2=brightenImg(im,p,out_dtype=np.uint8)
     return [im2]
 
 path_input = './imgs-P1/'
@@ -45,34 +157,45 @@ else:
 
 bAllTests = True
 if bAllTests:
-    tests = ['testHistEq', 'testBrightenImg', 'testDarkenImg']
+    tests = ['testHistEq', 'testClahe', 'testBrightenImg', 'testDarkenImg']
 else:
     tests = ['testHistEq']#['testBrightenImg']
 nameTests = {'testHistEq': "Histogram equalization",
+             'testClahe': "Adaptive histogram equalization (CLAHE)",
              'testBrightenImg': 'Brighten image',
              'testDarkenImg': 'Darken image'}
 suffixFiles = {'testHistEq': '_heq',
+               'testClahe': '_clahe',
                'testBrightenImg': '_br',
                'testDarkenImg': '_dk'}
 
+testFunctions = {'testHistEq': testHistEq,
+                 'testClahe': testClahe,
+                 'testBrightenImg': testBrightenImg,
+                 'testDarkenImg': testDarkenImg}
+
 bSaveResultImgs = True
+bDisplay = True # False for batch runs over many images
+nWorkers = None # worker processes running the tests (None = one per CPU)
+imgCacheDir = None # if set (e.g. './.img-cache/'), decoded images are kept there (.npy) and reused by later runs
 
 def doTests():
     print("Testing on", files)
-    for imfile in files:
-        im = np.array(Image.open(imfile).convert('L'))  # from Image to array
-        for test in tests:
-            out = eval(test)(im)
-            im2 = out[0]
-            vpu.showImgsPlusHists(im, im2, title=nameTests[test])
-            if len(out) > 1:
-                vpu.showPlusInfo(out[1],"cumulative histogram" if test=="testHistEq" else None)
-            if bSaveResultImgs:
-                dirname,basename = os.path.dirname(imfile), os.path.basename(imfile)
-                fname, fext = os.path.splitext(basename)
-                #print(dname,basename)
-                pil_im = Image.fromarray(im2.astype(np.uint8))  # from array to Image
-                pil_im.save(path_output+'//'+fname + suffixFiles[test] + fext)
+    # all (file x test) tasks run in parallel, each image is decoded once (by the worker running
+    # its tests, which sends it back so showing it below doesn't decode it again) and
+    # the result images are saved in the background (as '<name><suffix><ext>')
+    runner = BatchRunner(testFunctions, n_workers=nWorkers, suffixes=suffixFiles,
+                         output_dir=path_output if bSaveResultImgs else None,
+                         image_cache=ImageCache(disk_cache_dir=imgCacheDir),
+                         return_sources=bDisplay)
+    for res in runner.run(files, tests):
+        if res.outputs is None or not bDisplay:
+            continue
+        out, test = res.outputs, res.task.test
+        im = runner.load_image(res.task.file)[1]
+        vpu.showImgsPlusHists(im, out[0], title=nameTests[test])
+        if len(out) > 1:
+            vpu.showPlusInfo(out[1],"cumulative histogram" if test=="testHistEq" else None)
 
 if __name__== "__main__":
     doTests()
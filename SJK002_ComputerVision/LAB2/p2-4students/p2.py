@@ -14,6 +14,9 @@ import sys
 sys.path.append("../../p1/code") # set the path for visualPercepUtils.py
 import visualPercepUtils as vpu
 
+sys.path.append("../../..") # set the path for Common.py
+from Common import BatchRunner, ImageCache
+
 
 # -----------------------
 # Salt & pepper noise
@@ -181,50 +184,66 @@ medianFilter_sizes = [3, 7, 15]  # sizes of median filter
 
 testsUsingPIL = ['testSandPNoise']  # which test(s) uses PIL images as input (instead of NumPy 2D arrays)
 
+testFunctions = {'testSandPNoise': testSandPNoise,
+                 'testGaussianNoise': testGaussianNoise,
+                 'testAverageFilter': testAverageFilter,
+                 'testGaussianFilter': testGaussianFilter,
+                 'testMedianFilter': testMedianFilter}
+
+nWorkers = None  # worker processes running the tests (None = one per CPU)
+imgCacheDir = None  # if set (e.g. './.img-cache/'), decoded images are kept there (.npy) and reused by later runs
+
 
 # -----------------------------------------
 # Apply defined tests and display results
 # -----------------------------------------
 
+def testParams(test):
+    if test == "testGaussianNoise":
+        params = gauss_sigmas_noise
+        subTitle = r", $\sigma$: " + str(params)
+    elif test == "testSandPNoise":
+        params = percentagesSandP
+        subTitle = ", %: " + str(params)
+    elif test == "testAverageFilter":
+        params = {}
+        params['filterSizes'] = avgFilter_sizes
+        params['sp_pctg'] = percentagesSandP
+        subTitle = ", " + str(params)
+    elif test == "testMedianFilter":
+        params = {}
+        params['filterSizes'] = avgFilter_sizes
+        params['sp_pctg'] = percentagesSandP
+        subTitle = ", " + str(params)
+    elif test == "testGaussianFilter":
+        params = {}
+        params['sd_gauss_noise'] = gauss_sigmas_noise
+        params['sd_gauss_filter'] = gauss_sigmas_filter
+        subTitle = r", $\sigma_n$ (noise): " + str(gauss_sigmas_noise) + ", $\sigma_f$ (filter): " + str(gauss_sigmas_filter)
+    return params, subTitle
+
+
 def doTests():
     print("Testing on", files)
-    for imfile in files:
-        im_pil = Image.open(imfile).convert('L')
-        im = np.array(im_pil)  # from Image to array
-
-        for test in tests:
-
-            if test == "testGaussianNoise":
-                params = gauss_sigmas_noise
-                subTitle = r", $\sigma$: " + str(params)
-            elif test == "testSandPNoise":
-                params = percentagesSandP
-                subTitle = ", %: " + str(params)
-            elif test == "testAverageFilter":
-                params = {}
-                params['filterSizes'] = avgFilter_sizes
-                params['sp_pctg'] = percentagesSandP
-                subTitle = ", " + str(params)
-            elif test == "testMedianFilter":
-                params = {}
-                params['filterSizes'] = avgFilter_sizes
-                params['sp_pctg'] = percentagesSandP
-                subTitle = ", " + str(params)
-            elif test == "testGaussianFilter":
-                params = {}
-                params['sd_gauss_noise'] = gauss_sigmas_noise
-                params['sd_gauss_filter'] = gauss_sigmas_filter
-                subTitle = r", $\sigma_n$ (noise): " + str(gauss_sigmas_noise) + ", $\sigma_f$ (filter): " + str(gauss_sigmas_filter)
-            if test in testsUsingPIL:
-                outs_pil = eval(test)(im_pil, params)
-                outs_np = vpu.pil2np(outs_pil)
-            else:
-                # apply test to given image and given parameters
-                outs_np = eval(test)(im, params)
-                print("num images", len(outs_np))
-            print(len(outs_np))
-            # display original image, noisy images and filtered images
-            vpu.showInGrid([im] + outs_np, title=nameTests[test] + subTitle)
+    # all (file x test) tasks run in parallel and each image is decoded once, by the worker
+    # running its tests, which sends it back so showing it below doesn't decode it again
+    runner = BatchRunner(testFunctions, n_workers=nWorkers, pil_tests=testsUsingPIL,
+                         output_dir=path_output if bSaveResultImgs else None,
+                         image_cache=ImageCache(disk_cache_dir=imgCacheDir),
+                         return_sources=True)
+    params = {test: [testParams(test)[0]] for test in tests}
+    for res in runner.run(files, tests, params):
+        if res.outputs is None:
+            continue
+        test = res.task.test
+        if test in testsUsingPIL:
+            outs_np = vpu.pil2np(res.outputs)
+        else:
+            outs_np = res.outputs
+        print(len(outs_np))
+        im = runner.load_image(res.task.file)[1]
+        # display original image, noisy images and filtered images
+        vpu.showInGrid([im] + outs_np, title=nameTests[test] + testParams(test)[1])
 
 if __name__ == "__main__":
     doTests()
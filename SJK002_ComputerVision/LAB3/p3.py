@@ -14,6 +14,9 @@ import sys
 sys.path.append("../../p1/code") # set the path for visualPercepUtils.py
 import visualPercepUtils as vpu
 
+sys.path.append("../..") # set the path for Common.py
+from Common import BatchRunner, ImageCache
+
 # ----------------------
 # Fourier Transform
 # ----------------------
@@ -171,50 +174,65 @@ bSaveResultImgs = False
 
 testsUsingPIL = []  # which test(s) uses PIL images as input (instead of NumPy 2D arrays)
 
+testFunctions = {'testFT': testFT,
+                 'testConvTheo': testConvTheo,
+                 'testBandPassFilter': testBandPassFilter}
+
+nWorkers = None  # worker processes running the tests (None = one per CPU)
+imgCacheDir = None  # if set (e.g. './.img-cache/'), decoded images are kept there (.npy) and reused by later runs
+
 
 # -----------------------------------------
 # Apply defined tests and display results
 # -----------------------------------------
 
+def testParams(test):
+    if test == "testFT":
+        params = {}
+        subTitle = ": I, |F|, ang(F), IFT(F)"
+    elif test == "testConvTheo":
+        params = {}
+        params['filterSize'] = 7
+        subTitle = ": I, I*M, IFT(FT(I).FT(M))"
+    else:
+        params = {}
+        r,R = 5,None # for low-pass filter
+        # 5,30 for band-pass filter
+        # None, 30 for high-pass filter
+        params['r'], params['R'] = r,R
+        # let's assume r and R are not both None simultaneously
+        if r is None:
+            filter="high pass" + " (R=" + str(R) + ")"
+        elif R is None:
+            filter="low pass" + " (r=" + str(r) + ")"
+        else:
+            filter="band pass" + " (r=" + str(r) + ", R=" + str(R) + ")"
+        subTitle = ", " + filter + " filter"
+    return params, subTitle
+
+
 def doTests():
     print("Testing on", files)
-    for imfile in files:
-        im_pil = Image.open(imfile).convert('L')
-        im = np.array(im_pil)  # from Image to array
-
-        for test in tests:
-            if test is "testFT":
-                params = {}
-                subTitle = ": I, |F|, ang(F), IFT(F)"
-            elif test is "testConvTheo":
-                params = {}
-                params['filterSize'] = 7
-                subTitle = ": I, I*M, IFT(FT(I).FT(M))"
-            else:
-                params = {}
-                r,R = 5,None # for low-pass filter
-                # 5,30 for band-pass filter
-                # None, 30 for high-pass filter
-                params['r'], params['R'] = r,R
-                # let's assume r and R are not both None simultaneously
-                if r is None:
-                    filter="high pass" + " (R=" + str(R) + ")"
-                elif R is None:
-                    filter="low pass" + " (r=" + str(r) + ")"
-                else:
-                    filter="band pass" + " (r=" + str(r) + ", R=" + str(R) + ")"
-                subTitle = ", " + filter + " filter"
-
-            if test in testsUsingPIL:
-                outs_pil = eval(test)(im_pil, params)
-                outs_np = vpu.pil2np(outs_pil)
-            else:
-                # apply test to given image and given parameters
-                outs_np = eval(test)(im, params)
-            print("# images", len(outs_np))
-            print(len(outs_np))
-
-            vpu.showInGrid([im] + outs_np, title=nameTests[test] + subTitle)
+    # all (file x test) tasks run in parallel and each image is decoded once, by the worker
+    # running its tests, which sends it back so showing it below doesn't decode it again
+    runner = BatchRunner(testFunctions, n_workers=nWorkers, pil_tests=testsUsingPIL,
+                         output_dir=path_output if bSaveResultImgs else None,
+                         image_cache=ImageCache(disk_cache_dir=imgCacheDir),
+                         return_sources=True)
+    params = {test: [testParams(test)[0]] for test in tests}
+    for res in runner.run(files, tests, params):
+        if res.outputs is None:
+            continue
+        test = res.task.test
+        if test in testsUsingPIL:
+            outs_np = vpu.pil2np(res.outputs)
+        else:
+            outs_np = res.outputs
+        print("# images", len(outs_np))
+        print(len(outs_np))
+
+        im = runner.load_image(res.task.file)[1]
+        vpu.showInGrid([im] + outs_np, title=nameTests[test] + testParams(test)[1])
 
 
 if __name__ == "__main__":
@@ -14,6 +14,9 @@ from copy import deepcopy
 sys.path.append("../../p1/code")
 import visualPercepUtils as vpu
 
+sys.path.append("../..") # set the path for Common.py
+from Common import BatchRunner, ImageCache
+
 bLecturerVersion=False
 # try:
 #     import p4e
@@ -77,51 +80,67 @@ nameTests = {'testSobel': 'Detector de Sobel',
              'testCanny': 'Detector de Canny',
              'testHough': 'Transformada de Hough'}
 
+testFunctions = {'testSobel': testSobel,
+                 'testCanny': testCanny,
+                 'testHough': testHough}
+
 bAddNoise = True
 bRotate = False
+nWorkers = None  # worker processes running the tests (None = one per CPU)
+imgCacheDir = None  # if set (e.g. './.img-cache/'), decoded images are kept there (.npy) and reused by later runs
+
+
+def preprocessImage(im):
+    if bRotate:
+        im = ndi.rotate(im, 15, mode='nearest')
+
+    if bAddNoise:
+        im = im + np.random.normal(loc=0, scale=5, size=im.shape)
+    return im
+
+
+def testParams(test):
+    if test == "testSobel":
+        params = {}
+    elif test in ["testCanny", "testHough"]:
+        params = {}
+        params['sigma'] = 5  # 15
+    if test == "testHough":
+        pass  # params={}
+    return params
 
 
 def doTests():
     print("Testing on", files)
     nFiles = len(files)
     nFig = None
-    for test in tests:
-        if test is "testSobel":
-            params = {}
-        elif test in ["testCanny", "testHough"]:
-            params = {}
-            params['sigma'] = 5  # 15
-        if test is "testHough":
-            pass  # params={}
-
-        for i, imfile in enumerate(files):
-            print("testing", test, "on", imfile)
-
-            im_pil = Image.open(imfile).convert('L')
-            im = np.array(im_pil)  # from Image to array
-
-            if bRotate:
-                im = ndi.rotate(im, 15, mode='nearest')
-
-            if bAddNoise:
-                im = im + np.random.normal(loc=0, scale=5, size=im.shape)
-
-            outs_np = eval(test)(im, params)
-            print("num ouputs", len(outs_np))
-            if test is "testHough":
-                outs_np_plot = outs_np[0:1]
-            else:
-                outs_np_plot = outs_np
-            nFig = vpu.showInFigs([im] + outs_np_plot, title=nameTests[test], nFig=nFig, bDisplay=True)  # bDisplay=True for displaying *now* and waiting for user to close
-
-            if test is "testHough":
-                H, thetas, rhos = outs_np[1]  # second output is not directly displayable
-                peaks_values, peaks_thetas, peaks_rhos = findPeaks(H, thetas, rhos, nPeaksMax=None)
-                vpu.displayHoughPeaks(H, peaks_values, peaks_thetas, peaks_rhos, thetas, rhos)
-                if bLecturerVersion:
-                    p4e.displayLines(im, peaks_thetas, peaks_rhos, peaks_values) # exercise
-                    plt.show(block=True)
-                # displayLineSegments(...) # optional exercise
+    # all (file x test) tasks run in parallel, each image is decoded once (noise and rotation
+    # are still applied per test); the noisy inputs are kept to display them
+    runner = BatchRunner(testFunctions, n_workers=nWorkers, preprocess=preprocessImage,
+                         keep_inputs=True, image_cache=ImageCache(disk_cache_dir=imgCacheDir))
+    results = runner.run(files, tests, {test: [testParams(test)] for test in tests})
+    for res in sorted(results, key=lambda res: tests.index(res.task.test)):
+        test, imfile, im = res.task.test, res.task.file, res.input
+        print("testing", test, "on", imfile)
+        if res.outputs is None:
+            continue
+
+        outs_np = res.outputs
+        print("num ouputs", len(outs_np))
+        if test == "testHough":
+            outs_np_plot = outs_np[0:1]
+        else:
+            outs_np_plot = outs_np
+        nFig = vpu.showInFigs([im] + outs_np_plot, title=nameTests[test], nFig=nFig, bDisplay=True)  # bDisplay=True for displaying *now* and waiting for user to close
+
+        if test == "testHough":
+            H, thetas, rhos = outs_np[1]  # second output is not directly displayable
+            peaks_values, peaks_thetas, peaks_rhos = findPeaks(H, thetas, rhos, nPeaksMax=None)
+            vpu.displayHoughPeaks(H, peaks_values, peaks_thetas, peaks_rhos, thetas, rhos)
+            if bLecturerVersion:
+                p4e.displayLines(im, peaks_thetas, peaks_rhos, peaks_values) # exercise
+                plt.show(block=True)
+            # displayLineSegments(...) # optional exercise
 
     plt.show(block=True)  # show pending plots (useful if we used bDisplay=False in vpu.showInFigs())
 